@@ -36,8 +36,13 @@ class FlightProfileAnalyzer:
         if not waypoints:
             raise ValueError(f"Failed to parse coordinates from {kml_path}")
         
+        return self.get_chronological_crossings_from_coordinates(waypoints, sample_distance_km)
+    
+    def get_chronological_crossings_from_coordinates(self, waypoints: List[Tuple[float, float, float]],
+                                                     sample_distance_km: float = 5.0) -> List[Dict]:
+        """Same as get_chronological_crossings, for (lon, lat, alt_ft) coordinates already parsed"""
         # Determine if this is a trace or route file and handle accordingly
-        is_trace = KMLFlightPathParser.is_trace_file(kml_path)
+        is_trace = KMLFlightPathParser.is_trace_coordinates(waypoints)
         
         if is_trace:
             # For trace files, we already have dense data - thin it out for analysis
@@ -121,7 +126,7 @@ class FlightProfileAnalyzer:
             raise ValueError(f"Failed to parse coordinates from {kml_path}")
         
         # Determine if this is a trace or route file
-        is_trace = KMLFlightPathParser.is_trace_file(kml_path)
+        is_trace = KMLFlightPathParser.is_trace_coordinates(waypoints)
         
         if is_trace:
             # For trace files, we already have dense data - thin it out for analysis
@@ -235,10 +235,22 @@ class KMLFlightPathParser:
             List of (name, lon, lat, alt_ft) tuples
         """
         try:
-            # Read the file content
             with open(kml_file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-            
+        except Exception as e:
+            print(f"Error parsing KML waypoints: {e}")
+            return []
+        
+        return KMLFlightPathParser.parse_kml_waypoints_with_names_content(content)
+    
+    @staticmethod
+    def parse_kml_waypoints_with_names_content(content: str) -> List[Tuple[str, float, float, float]]:
+        """Extract waypoint names and coordinates from KML content already read in memory
+        
+        Returns:
+            List of (name, lon, lat, alt_ft) tuples
+        """
+        try:
             # Clean up namespace issues
             import re
             cleaned_content = re.sub(r'gx:', '', content)  # Remove gx: prefix
@@ -272,7 +284,7 @@ class KMLFlightPathParser:
             
             # If no waypoints from points, try to get from LineString and generate names
             if not waypoints:
-                coordinates = KMLFlightPathParser.parse_kml_coordinates(kml_file_path)
+                coordinates = KMLFlightPathParser.parse_kml_coordinates_content(content)
                 waypoints = [(f"WP{i+1:02d}", lon, lat, alt_ft) for i, (lon, lat, alt_ft) in enumerate(coordinates)]
             
             if waypoints:
@@ -285,17 +297,25 @@ class KMLFlightPathParser:
         except Exception as e:
             print(f"Error parsing KML waypoints: {e}")
             # Fallback to coordinates without names
-            coordinates = KMLFlightPathParser.parse_kml_coordinates(kml_file_path)
+            coordinates = KMLFlightPathParser.parse_kml_coordinates_content(content)
             return [(f"WP{i+1:02d}", lon, lat, alt_ft) for i, (lon, lat, alt_ft) in enumerate(coordinates)]
 
     @staticmethod
     def parse_kml_coordinates(kml_file_path: str) -> List[Tuple[float, float, float]]:
         """Extract coordinates from KML file"""
         try:
-            # Read the file and clean up any namespace issues
             with open(kml_file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-            
+        except Exception as e:
+            print(f"Error parsing KML: {e}")
+            return []
+        
+        return KMLFlightPathParser.parse_kml_coordinates_content(content)
+    
+    @staticmethod
+    def parse_kml_coordinates_content(content: str) -> List[Tuple[float, float, float]]:
+        """Extract coordinates from KML content already read in memory"""
+        try:
             # Simple approach: find coordinates using string parsing first
             # This avoids XML namespace issues
             import re
@@ -410,6 +430,11 @@ class KMLFlightPathParser:
     def is_trace_file(kml_file_path: str) -> bool:
         """Determine if KML file contains a flight trace (many points) vs route (few waypoints)"""
         coordinates = KMLFlightPathParser.parse_kml_coordinates(kml_file_path)
+        return KMLFlightPathParser.is_trace_coordinates(coordinates)
+    
+    @staticmethod
+    def is_trace_coordinates(coordinates: List[Tuple[float, float, float]]) -> bool:
+        """Same as is_trace_file, for coordinates already parsed"""
         return len(coordinates) > 50  # Threshold to distinguish trace from route
 
 
@@ -136,6 +136,17 @@ class AIXMExtractor:
             CREATE INDEX IF NOT EXISTS idx_vertical_limits_airspace_id ON vertical_limits(airspace_id);
         """)
         
+        # Index spatial R*Tree des emprises (bounding box) des espaces aériens ;
+        # facultatif : sans le module RTREE, search_by_bbox se rabat sur une requête SQL
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS airspace_rtree USING rtree(
+                    id, minLon, maxLon, minLat, maxLat
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Index spatial R*Tree indisponible: {e}")
+        
         conn.commit()
         conn.close()
         logger.info("Base de données initialisée")
@@ -280,6 +291,7 @@ class AIXMExtractor:
     def extract_vertices_from_abd(self, abd_element, border_id: int, conn: sqlite3.Connection):
         """Extrait les vertices d'un élément Abd"""
         avx_elements = abd_element.findall('Avx')
+        vertices = []
         
         for avx in avx_elements:
             try:
@@ -293,17 +305,19 @@ class AIXMExtractor:
                     sequence = int(seq_elem.text) if seq_elem is not None and seq_elem.text else 1
                     
                     if latitude is not None and longitude is not None:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            INSERT INTO border_vertices 
-                            (border_id, sequence_number, latitude, longitude)
-                            VALUES (?, ?, ?, ?)
-                        """, (border_id, sequence, latitude, longitude))
-                        
-                        self.vertex_count += 1
+                        vertices.append((border_id, sequence, latitude, longitude))
             
             except Exception as e:
                 logger.error(f"Erreur lors de l'extraction du vertex: {e}")
+        
+        # Insertion groupée des vertices de la frontière
+        if vertices:
+            conn.executemany("""
+                INSERT INTO border_vertices 
+                (border_id, sequence_number, latitude, longitude)
+                VALUES (?, ?, ?, ?)
+            """, vertices)
+            self.vertex_count += len(vertices)
     
     def process_borders_pass2(self, conn: sqlite3.Connection):
         """Deuxième passe : extraire les frontières et leurs vertices"""
@@ -347,6 +361,32 @@ class AIXMExtractor:
         conn.commit()
         logger.info(f"Passe 2 terminée: {self.border_count} frontières extraites, {self.vertex_count} vertices")
     
+    def build_spatial_index(self, conn: sqlite3.Connection):
+        """Remplit l'index R*Tree avec l'emprise de chaque espace aérien (s'il a pu être créé)"""
+        has_rtree = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'airspace_rtree'"
+        ).fetchone()
+        if not has_rtree:
+            logger.info("Index spatial ignoré: table airspace_rtree absente")
+            return
+        
+        logger.info("=== CONSTRUCTION DE L'INDEX SPATIAL ===")
+        
+        conn.execute("DELETE FROM airspace_rtree")
+        conn.execute("""
+            INSERT INTO airspace_rtree (id, minLon, maxLon, minLat, maxLat)
+            SELECT ab.airspace_id, 
+                   MIN(bv.longitude), MAX(bv.longitude), 
+                   MIN(bv.latitude), MAX(bv.latitude)
+            FROM airspace_borders ab
+            JOIN border_vertices bv ON bv.border_id = ab.id
+            GROUP BY ab.airspace_id
+        """)
+        conn.commit()
+        
+        indexed = conn.execute("SELECT COUNT(*) FROM airspace_rtree").fetchone()[0]
+        logger.info(f"Index spatial construit: {indexed} espaces aériens")
+    
     def extract_complete_data(self):
         """Méthode principale d'extraction complète"""
         logger.info("Début de l'extraction complète des données AIXM")
@@ -363,6 +403,16 @@ class AIXMExtractor:
             # Passe 2: Frontières et vertices
             self.process_borders_pass2(conn)
             
+            # Index spatial des emprises
+            self.build_spatial_index(conn)
+
+            # Statistiques pour le planificateur de requêtes (sqlite_stat1)
+            # et journal WAL vidé pour les lecteurs
+            conn.execute("ANALYZE")
+            conn.commit()
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction: {e}")
             conn.rollback()
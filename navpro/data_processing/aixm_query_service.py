@@ -4,9 +4,57 @@
 Service de requête pour les espaces aériens AIXM
 """
 
-import sqlite3
+import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Sequence
+
+# Utilise pysqlite3 (SQLite plus récent) si disponible, sinon le module standard
+try:
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
+
+# Répertoire navpro dans le path pour la configuration partagée
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.config import API_CONFIG
+
+# Durée de vie du cache des statistiques
+STATISTICS_CACHE_TTL = API_CONFIG['cache_ttl_seconds']
+
+# Cache des statistiques par base de données: db_path -> (timestamp, mtime du fichier, stats)
+# Une base reconstruite (nouveau mtime) invalide l'entrée
+_statistics_cache: Dict[str, tuple] = {}
+
+# Colonnes à faible cardinalité dont les valeurs sont partagées entre résultats
+_INTERNED_COLUMNS = ('code_type', 'airspace_class', 'lower_limit_ref', 'upper_limit_ref', 
+                     'unit_of_measure', 'altitude_display')
+
+# Colonnes de la table airspaces par base de données: db_path -> frozenset (lues via PRAGMA table_info)
+_ALLOWED_COLUMNS: Dict[str, frozenset] = {}
+
+# Colonnes renvoyées par défaut (created_at n'est utilisé par aucun appelant)
+DEFAULT_AIRSPACE_COLUMNS = ('id', 'code_id', 'code_type', 'mid', 'name', 
+                            'airspace_class', 'activity_type', 'updated_at')
+
+# Nombre de frontières et de vertices par espace aérien (sous-requêtes indexées)
+_GEOMETRY_COUNTS_SQL = """
+    (SELECT COUNT(*) FROM airspace_borders ab WHERE ab.airspace_id = a.id) AS border_count,
+    (SELECT COUNT(*) FROM border_vertices bv 
+     JOIN airspace_borders ab ON bv.border_id = ab.id 
+     WHERE ab.airspace_id = a.id) AS vertex_count"""
+
+# Affichage des altitudes calculé par SQLite à partir de vertical_limits
+_ALTITUDE_DISPLAY_SQL = """
+    CASE
+        WHEN vl.lower_limit_ft IS NOT NULL AND vl.upper_limit_ft IS NOT NULL
+            THEN vl.lower_limit_ft || '-' || vl.upper_limit_ft || ' ' || COALESCE(vl.unit_of_measure, 'FT')
+        WHEN vl.lower_limit_ft IS NOT NULL
+            THEN vl.lower_limit_ft || '+ ' || COALESCE(vl.unit_of_measure, 'FT')
+        WHEN vl.upper_limit_ft IS NOT NULL
+            THEN '0-' || vl.upper_limit_ft || ' ' || COALESCE(vl.unit_of_measure, 'FT')
+        ELSE 'No altitude limits'
+    END"""
 
 class AirspaceQueryService:
     """Service pour interroger les espaces aériens extraits"""
@@ -18,30 +66,51 @@ class AirspaceQueryService:
             db_path = current_dir.parent / "data" / "airspaces.db"
         
         self.db_path = str(db_path)
+        self._str_intern: Dict[str, str] = {}  # Chaînes partagées entre résultats
         self._validate_database()
 
     def _validate_database(self):
-        """Valide que la base de données existe"""
+        """Valide que la base de données existe et relève ses colonnes (une seule fois par fichier)"""
+        if self.db_path in _ALLOWED_COLUMNS:
+            return
+        
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            columns = [row[0] for row in conn.execute(
+                "SELECT name FROM pragma_table_info('airspaces')"
+            )]
             conn.close()
             
-            if 'airspaces' not in tables:
+            if not columns:
                 raise Exception("Table 'airspaces' manquante")
                 
         except Exception as e:
             raise Exception(f"Erreur base de données: {e}")
+        
+        _ALLOWED_COLUMNS[self.db_path] = frozenset(columns)
+
+    def _select_columns(self, columns: Optional[Sequence[str]], alias: str = "") -> str:
+        """Construit la liste explicite des colonnes de airspaces à sélectionner"""
+        if columns is None:
+            columns = [col for col in DEFAULT_AIRSPACE_COLUMNS if col in _ALLOWED_COLUMNS[self.db_path]]
+        
+        unknown = [col for col in columns if col not in _ALLOWED_COLUMNS[self.db_path]]
+        if unknown or not columns:
+            raise ValueError(f"Colonnes invalides pour airspaces: {unknown or columns}")
+        
+        prefix = f"{alias}." if alias else ""
+        return ", ".join(f'{prefix}"{col}"' for col in columns)
 
-    def search_airspaces(self, airspace_type: str = None, name_pattern: str = None) -> List[Dict]:
-        """Recherche les espaces aériens"""
+    def search_airspaces(self, airspace_type: str = None, name_pattern: str = None,
+                         columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Recherche les espaces aériens (columns: colonnes à renvoyer, défaut DEFAULT_AIRSPACE_COLUMNS)"""
+        select_columns = self._select_columns(columns)
+        
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        query = "SELECT * FROM airspaces WHERE 1=1"
+        query = f"SELECT {select_columns} FROM airspaces WHERE 1=1"
         params = []
         
         if airspace_type:
@@ -57,7 +126,57 @@ class AirspaceQueryService:
         conn.close()
         return results
 
-    def search_by_keyword(self, keyword: str, case_sensitive: bool = False, limit: int = None) -> List[Dict]:
+    def search_by_bbox(self, lat_min: float, lat_max: float, 
+                       lon_min: float, lon_max: float,
+                       columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Search airspaces whose bounding box intersects the given area
+        
+        Args:
+            lat_min (float): Southern latitude of the area
+            lat_max (float): Northern latitude of the area
+            lon_min (float): Western longitude of the area
+            lon_max (float): Eastern longitude of the area
+            columns (Sequence[str]): Airspace columns to return (None for the default list)
+            
+        Returns:
+            List[Dict]: Airspace records intersecting the area
+        """
+        select_columns = self._select_columns(columns, alias="a")
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        params = (lon_min, lon_max, lat_min, lat_max)
+        try:
+            # R*Tree descent on the airspace_rtree spatial index
+            cursor.execute(f"""
+                SELECT {select_columns} FROM airspaces a 
+                JOIN airspace_rtree r ON a.id = r.id
+                WHERE r.maxLon >= ? AND r.minLon <= ? AND r.maxLat >= ? AND r.minLat <= ?
+            """, params)
+        except sqlite3.OperationalError:
+            # Database built without the spatial index: compute bounding boxes on the fly
+            cursor.execute(f"""
+                SELECT {select_columns} FROM airspaces a
+                JOIN (
+                    SELECT ab.airspace_id AS id,
+                           MIN(bv.longitude) AS minLon, MAX(bv.longitude) AS maxLon,
+                           MIN(bv.latitude) AS minLat, MAX(bv.latitude) AS maxLat
+                    FROM airspace_borders ab
+                    JOIN border_vertices bv ON bv.border_id = ab.id
+                    GROUP BY ab.airspace_id
+                ) r ON a.id = r.id
+                WHERE r.maxLon >= ? AND r.minLon <= ? AND r.maxLat >= ? AND r.minLat <= ?
+            """, params)
+        
+        results = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return results
+
+    def search_by_keyword(self, keyword: str, case_sensitive: bool = False, limit: int = None,
+                          columns: Optional[Sequence[str]] = None) -> List[Dict]:
         """
         Search airspaces by keyword with detailed information
         
@@ -65,33 +184,49 @@ class AirspaceQueryService:
             keyword (str): Keyword to search for in airspace names
             case_sensitive (bool): Whether search should be case sensitive
             limit (int): Maximum number of results to return (None for all)
+            columns (Sequence[str]): Airspace columns to return (None for the default list)
             
         Returns:
             List[Dict]: List of detailed airspace records matching the keyword
         """
+        return list(self.iter_by_keyword(keyword, case_sensitive, limit, columns))
+
+    def iter_by_keyword(self, keyword: str, case_sensitive: bool = False, limit: int = None,
+                        columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Lazily yield airspaces matching a keyword, one detailed record at a time
+        
+        Args:
+            keyword (str): Keyword to search for in airspace names
+            case_sensitive (bool): Whether search should be case sensitive
+            limit (int): Maximum number of results to return (None for all)
+            columns (Sequence[str]): Airspace columns to return (None for the default list)
+            
+        Yields:
+            Dict: Detailed airspace record matching the keyword
+        """
+        select_columns = self._select_columns(columns, alias="a")
+        
         conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
         
         # Build search query - search in both name AND code_id
         if case_sensitive:
-            where_clause = "WHERE (name LIKE ? OR code_id LIKE ?)"
+            where_clause = "WHERE (a.name LIKE ? OR a.code_id LIKE ?)"
             search_pattern = f'%{keyword}%'
             params = [search_pattern, search_pattern]
         else:
-            where_clause = "WHERE (UPPER(name) LIKE UPPER(?) OR UPPER(code_id) LIKE UPPER(?))"
+            where_clause = "WHERE (UPPER(a.name) LIKE UPPER(?) OR UPPER(a.code_id) LIKE UPPER(?))"
             search_pattern = f'%{keyword}%'
             params = [search_pattern, search_pattern]
         
-        # Get all columns available in the table
-        cursor.execute("PRAGMA table_info(airspaces)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        # Build the main query with altitude information from vertical_limits table
-        query = f"""
-        SELECT a.*, 
+        # Build the main query with altitude information from vertical_limits table,
+        # geometry counts and the altitude display string are computed by SQLite
+        query_template = """
+        SELECT {select_columns}, 
                vl.lower_limit_ft, vl.upper_limit_ft, 
-               vl.lower_limit_ref, vl.upper_limit_ref, vl.unit_of_measure
+               vl.lower_limit_ref, vl.upper_limit_ref, vl.unit_of_measure,
+               {geometry_columns},
+               {altitude_display} AS altitude_display
         FROM airspaces a
         LEFT JOIN vertical_limits vl ON a.id = vl.airspace_id
         {where_clause}
@@ -99,61 +234,41 @@ class AirspaceQueryService:
         """
         
         if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query, params)
-        raw_results = cursor.fetchall()
+            query_template += f" LIMIT {limit}"
         
-        # Convert to detailed dictionaries
-        detailed_results = []
-        for row in raw_results:
-            airspace_data = dict(row)
-            
-            # Get geometry information if available
-            airspace_id = airspace_data['id']
-            
-            # Check for borders/geometry
+        try:
             try:
-                cursor.execute("SELECT COUNT(*) as border_count FROM airspace_borders WHERE airspace_id = ?", (airspace_id,))
-                border_count = cursor.fetchone()
-                airspace_data['border_count'] = border_count[0] if border_count else 0
-                
-                if airspace_data['border_count'] > 0:
-                    cursor.execute("""
-                        SELECT COUNT(*) as vertex_count 
-                        FROM border_vertices 
-                        WHERE border_id IN (SELECT id FROM airspace_borders WHERE airspace_id = ?)
-                    """, (airspace_id,))
-                    vertex_count = cursor.fetchone()
-                    airspace_data['vertex_count'] = vertex_count[0] if vertex_count else 0
-                else:
-                    airspace_data['vertex_count'] = 0
-                    
+                cursor = conn.execute(query_template.format(
+                    select_columns=select_columns,
+                    geometry_columns=_GEOMETRY_COUNTS_SQL,
+                    altitude_display=_ALTITUDE_DISPLAY_SQL,
+                    where_clause=where_clause
+                ), params)
             except sqlite3.OperationalError:
-                # Tables don't exist
-                airspace_data['border_count'] = 0
-                airspace_data['vertex_count'] = 0
-            
-            # Format altitude information for display using vertical_limits data
-            min_alt = airspace_data.get('lower_limit_ft')
-            max_alt = airspace_data.get('upper_limit_ft')
-            min_unit = airspace_data.get('lower_limit_ref', '')
-            max_unit = airspace_data.get('upper_limit_ref', '')
-            unit_measure = airspace_data.get('unit_of_measure', 'FT')
+                # Geometry tables don't exist
+                cursor = conn.execute(query_template.format(
+                    select_columns=select_columns,
+                    geometry_columns="0 AS border_count, 0 AS vertex_count",
+                    altitude_display=_ALTITUDE_DISPLAY_SQL,
+                    where_clause=where_clause
+                ), params)
             
-            if min_alt is not None and max_alt is not None:
-                airspace_data['altitude_display'] = f"{min_alt}-{max_alt} {unit_measure}"
-            elif min_alt is not None:
-                airspace_data['altitude_display'] = f"{min_alt}+ {unit_measure}"
-            elif max_alt is not None:
-                airspace_data['altitude_display'] = f"0-{max_alt} {unit_measure}"
-            else:
-                airspace_data['altitude_display'] = "No altitude limits"
+            columns = [col[0] for col in cursor.description]
+            interned_columns = [col for col in _INTERNED_COLUMNS if col in columns]
+            str_intern = self._str_intern
             
-            detailed_results.append(airspace_data)
-        
-        conn.close()
-        return detailed_results
+            # Stream rows from the cursor
+            for row in cursor:
+                airspace_data = dict(zip(columns, row))
+                
+                # Share repeated small strings (types, classes, units) across rows
+                for column in interned_columns:
+                    value = airspace_data[column]
+                    airspace_data[column] = str_intern.setdefault(value, value)
+                
+                yield airspace_data
+        finally:
+            conn.close()
 
     def get_airspace_details(self, code_id: str) -> Optional[Dict]:
         """
@@ -172,7 +287,16 @@ class AirspaceQueryService:
         return exact_matches[0] if exact_matches else None
 
     def get_statistics(self) -> Dict[str, any]:
-        """Retourne les statistiques de la base de données"""
+        """Retourne les statistiques de la base de données (mises en cache)"""
+        try:
+            db_mtime = Path(self.db_path).stat().st_mtime_ns
+        except OSError:
+            db_mtime = None
+        
+        cached = _statistics_cache.get(self.db_path)
+        if cached and cached[1] == db_mtime and time.monotonic() - cached[0] < STATISTICS_CACHE_TTL:
+            return dict(cached[2])
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -180,11 +304,11 @@ class AirspaceQueryService:
         total_airspaces = cursor.fetchone()[0]
         
         try:
+            # Index-only scan on airspace_borders, EXISTS stops at the first vertex
             cursor.execute("""
-                SELECT COUNT(DISTINCT a.id) 
-                FROM airspaces a 
-                JOIN airspace_borders ab ON a.id = ab.airspace_id 
-                JOIN border_vertices bv ON ab.id = bv.border_id
+                SELECT COUNT(DISTINCT ab.airspace_id) 
+                FROM airspace_borders ab 
+                WHERE EXISTS (SELECT 1 FROM border_vertices bv WHERE bv.border_id = ab.id)
             """)
             airspaces_with_geometry = cursor.fetchone()[0]
         except:
@@ -200,13 +324,14 @@ class AirspaceQueryService:
         
         geometry_coverage = (airspaces_with_geometry / total_airspaces * 100) if total_airspaces > 0 else 0
         
-        return {
+        stats = {
             "total_airspaces": total_airspaces,
             "airspaces_with_geometry": airspaces_with_geometry,
             "geometry_coverage": geometry_coverage,
             "total_vertices": total_vertices
         }
-
+        _statistics_cache[self.db_path] = (time.monotonic(), db_mtime, stats)
+        return dict(stats)
 
 if __name__ == "__main__":
     try:
@@ -10,27 +10,45 @@ if not db_path.exists():
 print(f"📂 Checking database: {db_path}")
 
 try:
-    conn = sqlite3.connect(db_path)
+    # Read-only connection: no journal/WAL recovery writes while inspecting
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
     cursor = conn.cursor()
-    
-    # Get all tables
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in cursor.fetchall()]
-    
+
+    # Get all tables with their column names in a single query
+    cursor.execute("""
+        SELECT m.name, p.name
+        FROM sqlite_master m, pragma_table_info(m.name) p
+        WHERE m.type = 'table'
+        ORDER BY m.name, p.cid
+    """)
+    columns_by_table = {}
+    for table, column in cursor.fetchall():
+        columns_by_table.setdefault(table, []).append(column)
+    tables = list(columns_by_table)
+
     print(f"🗂️  Tables found: {tables}")
-    
-    # Get table info for each table
+
+    # Row counts: use ANALYZE statistics when available (O(1)),
+    # otherwise count the remaining tables in one batched statement
+    row_counts = {}
+    if 'sqlite_stat1' in columns_by_table:
+        cursor.execute("SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 GROUP BY tbl")
+        row_counts = {table: count for table, count in cursor.fetchall() if table in columns_by_table}
+
+    missing = [table for table in tables if table not in row_counts]
+    if missing:
+        count_query = " UNION ALL ".join(
+            "SELECT ?, (SELECT COUNT(*) FROM \"{}\")".format(table.replace('"', '""'))
+            for table in missing
+        )
+        cursor.execute(count_query, missing)
+        row_counts.update(cursor.fetchall())
+
     for table in tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cursor.fetchone()[0]
-        print(f"   {table}: {count} rows")
-        
-        # Get column info
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [col[1] for col in cursor.fetchall()]
-        print(f"     Columns: {columns}")
-    
+        print(f"   {table}: {row_counts[table]} rows")
+        print(f"     Columns: {columns_by_table[table]}")
+
     conn.close()
-    
+
 except Exception as e:
-    print(f"❌ Error: {e}")
\ No newline at end of file
+    print(f"❌ Error: {e}")
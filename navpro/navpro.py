@@ -6,6 +6,7 @@ Access airspace services and generate KML volumes with consistent subcommand str
 """
 
 import argparse
+import multiprocessing
 import sys
 import os
 from pathlib import Path
@@ -353,7 +354,7 @@ def cmd_list(args, kml_service):
                             if geom['type'] == 'circle':
                                 print(f"     - Circle: radius {geom['radius_km']} km")
                             elif geom['type'] == 'polygon':
-                                vertex_count = len(geom.get('vertices', []))
+                                vertex_count = len(geom.get('lat', []))
                                 print(f"     - Polygon: {vertex_count} vertices")
                     else:
                         print(f"   Geometry: ⚠️  No geometry data")
@@ -404,7 +405,7 @@ def cmd_fix_profile_for_subcommand(args, kml_file):
         corrected_file = f"{base_name}_corrected.kml"
         
         # Generate corrected profile
-        corrector.correct_kml_file(kml_file, corrected_file)
+        corrector.correct_kml_file(kml_file, corrected_file, verbose=not args.quiet)
         
         if not os.path.exists(corrected_file):
             print("❌ Error: Failed to generate corrected profile")
@@ -727,19 +728,16 @@ def cmd_generate_profile(args):
             flight_coordinates = KMLFlightPathParser.parse_kml_coordinates(kml_file)
             flight_waypoints = KMLFlightPathParser.parse_kml_waypoints_with_names(kml_file)
             
-            # Use generate_multiple_airspaces_kml method with flight path info
-            # This now organizes airspaces by type into KML folders
-            kml_content = kml_service_gen.generate_multiple_airspaces_kml(
+            # Use save_multiple_airspaces_kml method with flight path info
+            # This organizes airspaces by type into KML folders and streams them to the file
+            kml_service_gen.save_multiple_airspaces_kml(
                 unique_ids, 
+                str(combined_path),
                 flight_name=flight_name,
                 flight_coordinates=flight_coordinates if flight_coordinates else None,
                 flight_waypoints=flight_waypoints if flight_waypoints else None
             )
             
-            # Write to file
-            with open(combined_path, 'w', encoding='utf-8') as f:
-                f.write(kml_content)
-            
             generated_files.append({
                 'file': str(combined_path),
                 'type': 'combined',
@@ -749,6 +747,8 @@ def cmd_generate_profile(args):
         
         except Exception as e:
             print(f"      >> Error generating organized KML: {e}")
+        finally:
+            kml_service_gen.close()
         
         # Summary
         print()
@@ -934,13 +934,13 @@ def main():
         else:
             # Regular commands need KML service
             try:
-                kml_service = KMLVolumeService()
-                if args.command == 'list':
-                    cmd_list(args, kml_service)
-                elif args.command == 'generate':
-                    cmd_generate(args, kml_service)
-                elif args.command == 'stats':
-                    cmd_stats(args, kml_service)
+                with KMLVolumeService() as kml_service:
+                    if args.command == 'list':
+                        cmd_list(args, kml_service)
+                    elif args.command == 'generate':
+                        cmd_generate(args, kml_service)
+                    elif args.command == 'stats':
+                        cmd_stats(args, kml_service)
             except Exception as e:
                 print(f"❌ Error initializing services: {e}")
                 if args.verbose:
@@ -951,4 +951,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Process pool workers of the frozen executable must not relaunch the application
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
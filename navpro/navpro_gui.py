@@ -10,6 +10,7 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import sys
 import threading
+import multiprocessing
 import subprocess
 import webbrowser
 from pathlib import Path
@@ -1180,7 +1181,6 @@ class AirspaceCheckerGUI:
             self.log_output(">> Generating organized KML profile...")
             
             # Generate KML
-            kml_service = KMLVolumeService(db_path)  # Pass the database path
             flight_name = os.path.splitext(os.path.basename(analysis_file))[0]
             output_file = Path(self.output_dir.get()) / f"flight_profile_{flight_name}_combined.kml"
             
@@ -1193,17 +1193,16 @@ class AirspaceCheckerGUI:
             self.log_output(f"   >> Creating organized profile KML: {output_file.name}")
             self.log_output(f"      >> Organizing airspaces into KML folders by type")
             
-            kml_content = kml_service.generate_multiple_airspaces_kml(
-                unique_ids,
-                flight_name=flight_name,
-                flight_coordinates=flight_coordinates,
-                flight_waypoints=flight_waypoints,
-                show_intermediate_points=self.show_intermediate_points.get()
-            )
-            
-            # Write KML file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(kml_content)
+            # Generate and write KML file, closing the database connection afterwards
+            with KMLVolumeService(db_path) as kml_service:  # Pass the database path
+                kml_service.save_multiple_airspaces_kml(
+                    unique_ids,
+                    str(output_file),
+                    flight_name=flight_name,
+                    flight_coordinates=flight_coordinates,
+                    flight_waypoints=flight_waypoints,
+                    show_intermediate_points=self.show_intermediate_points.get()
+                )
             
             self.log_output(f"      >> Organized profile KML saved: {output_file}")
             self.log_output("")
@@ -1284,4 +1283,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Process pool workers of the frozen executable must not relaunch the application
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -5,16 +5,42 @@ Chemins et paramètres pour le système d'extraction AIXM
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
-# Répertoire racine du projet
-PROJECT_ROOT = Path(__file__).parent.parent
-print(f"Répertoire racine du projet: {PROJECT_ROOT}")
+# Chemins résolus à la première utilisation (pas de calcul à l'import)
+@lru_cache(maxsize=None)
+def project_root() -> Path:
+    """Répertoire racine du projet"""
+    return Path(__file__).parent.parent
 
-# Chemins des données
-DATA_DIR = PROJECT_ROOT / "data"
-AIXM_FILE = DATA_DIR / "AIXM4.5_all_FR_OM_2025-10-02.xml"
-DATABASE_FILE = DATA_DIR / "final_airspaces.db"
+@lru_cache(maxsize=None)
+def data_dir() -> Path:
+    """Répertoire des données"""
+    return project_root() / "data"
+
+@lru_cache(maxsize=None)
+def aixm_file() -> Path:
+    """Fichier AIXM source"""
+    return data_dir() / "AIXM4.5_all_FR_OM_2025-10-02.xml"
+
+@lru_cache(maxsize=None)
+def database_file() -> Path:
+    """Base de données des espaces aériens"""
+    return data_dir() / "final_airspaces.db"
+
+# Constantes de chemins exposées paresseusement (PEP 562)
+_LAZY_PATHS = {
+    "PROJECT_ROOT": project_root,
+    "DATA_DIR": data_dir,
+    "AIXM_FILE": aixm_file,
+    "DATABASE_FILE": database_file,
+}
+
+def __getattr__(name):
+    if name in _LAZY_PATHS:
+        return _LAZY_PATHS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Configuration de l'extraction
 EXTRACTION_CONFIG = {
@@ -36,6 +62,7 @@ API_CONFIG = {
 def validate_setup():
     """Valide que tous les fichiers nécessaires sont présents"""
     errors = []
+    AIXM_FILE, DATABASE_FILE, DATA_DIR = aixm_file(), database_file(), data_dir()
     
     if not AIXM_FILE.exists():
         errors.append(f"Fichier AIXM manquant: {AIXM_FILE}")
@@ -58,9 +85,10 @@ def validate_setup():
 
 if __name__ == "__main__":
     print("=== Configuration du Système d'Extraction AIXM ===")
-    print(f"Fichier AIXM: {AIXM_FILE}")
-    print(f"Base de données: {DATABASE_FILE}")
-    print(f"Répertoire des données: {DATA_DIR}")
+    print(f"Répertoire racine du projet: {project_root()}")
+    print(f"Fichier AIXM: {aixm_file()}")
+    print(f"Base de données: {database_file()}")
+    print(f"Répertoire des données: {data_dir()}")
     
     if validate_setup():
         print("\n🚀 Système prêt à l'emploi")
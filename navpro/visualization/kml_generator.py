@@ -6,17 +6,128 @@ Generates 3D KML volumes from airspace boundary geometry and altitude data
 """
 
 import sqlite3
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 import math
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from xml.sax.saxutils import escape
+
+# Optional JIT compilation of the circle kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Add production directory to path for color config import
 sys.path.insert(0, os.path.dirname(__file__))
 from visualization.kml_styling import get_airspace_color, get_line_color, LINE_WIDTH
 
+# Few distinct (type, class) pairs: memoize the color lookups across a batch
+get_airspace_color = lru_cache(maxsize=256)(get_airspace_color)
+get_line_color = lru_cache(maxsize=256)(get_line_color)
+
+# KML document wrapper, elements in between are written one per line
+KML_HEADER = '<kml xmlns="http://www.opengis.net/kml/2.2">'
+KML_FOOTER = '</kml>'
+
+# Altitude unit -> meters (FL is hundreds of feet), upper and lower case spellings
+UNIT_TO_METERS = {'FT': 0.3048, 'M': 1.0, 'FL': 30.48}
+UNIT_TO_METERS.update({unit.lower(): factor for unit, factor in UNIT_TO_METERS.items()})
+
+# Mean earth radius used for circle boundaries
+EARTH_RADIUS_KM = 6371
+
+# Length of one degree of latitude on that sphere
+KM_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+# Below this radius circles use the flat (equirectangular) approximation,
+# which stays within ~0.01 degree of the great-circle ring up to 65° latitude
+FLAT_EARTH_MAX_RADIUS_KM = 50
+
+# Above this many airspaces, batch queries read the ids from a temporary table
+MAX_IN_CLAUSE_IDS = 500
+
+# lon,lat,alt of a KML coordinate (~0.1 m horizontal, 0.1 m vertical precision)
+COORDINATE_FORMAT = '%.6f,%.6f,%.1f'
+
+# Templates for the repeated KML fragments, filled with a single format_map call
+_PLACEMARK_TEMPLATE = (
+    "<Placemark>\n"
+    "<name>{name}</name>\n"
+    "<description>{description}</description>\n"
+    "<styleUrl>#{style_id}</styleUrl>\n"
+    "{geometry}\n"
+    "</Placemark>"
+)
+_POLYGON_TEMPLATE = (
+    "<Polygon>\n"
+    "<altitudeMode>absolute</altitudeMode>\n"
+    "{extrude}"
+    "<outerBoundaryIs>\n<LinearRing>\n"
+    "<coordinates>{coordinates}</coordinates>\n"
+    "</LinearRing>\n</outerBoundaryIs>\n"
+    "</Polygon>"
+)
+_STYLE_TEMPLATE = (
+    '<Style id="{style_id}">\n'
+    "<PolyStyle>\n<color>{fill}</color>\n<fill>1</fill>\n<outline>1</outline>\n</PolyStyle>\n"
+    "<LineStyle>\n<color>{line}</color>\n<width>{width}</width>\n</LineStyle>\n"
+    "</Style>"
+)
+_EXTRUDE_TAG = "<extrude>1</extrude>\n"
+
+# Files are written in binary mode: the declaration is emitted as UTF-8 bytes
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+@lru_cache(maxsize=32)
+def _unit_circle(num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosines and sines of the ring bearings, shared by every circle with the same point count"""
+    angles = np.linspace(0, 2 * np.pi, num_points + 1)  # +1 to close the polygon
+    cos_angles, sin_angles = np.cos(angles), np.sin(angles)
+    
+    # Snap the closing bearing onto the first one so the ring closes exactly
+    cos_angles[-1], sin_angles[-1] = cos_angles[0], sin_angles[0]
+    
+    cos_angles.setflags(write=False)
+    sin_angles.setflags(write=False)
+    return cos_angles, sin_angles
+
+
+if njit is not None:
+    @njit("f8[:,:](f8, f8, f8, i8)", cache=True, fastmath=True)
+    def _circle_coords_numba(center_lat, center_lon, radius_km, n):
+        """Compiled circle kernel: (n+1, 2) array of (lat, lon) degrees, closed ring"""
+        coords = np.empty((n + 1, 2))
+        lat_rad = math.radians(center_lat)
+        lon_rad = math.radians(center_lon)
+        d = radius_km / EARTH_RADIUS_KM
+        sin_lat_cos_d = math.sin(lat_rad) * math.cos(d)
+        cos_lat_sin_d = math.cos(lat_rad) * math.sin(d)
+        cos_d = math.cos(d)
+        sin_lat = math.sin(lat_rad)
+        
+        for i in range(n):
+            angle = 2 * math.pi * i / n
+            sin_new_lat = sin_lat_cos_d + cos_lat_sin_d * math.cos(angle)
+            coords[i, 0] = math.degrees(math.asin(sin_new_lat))
+            coords[i, 1] = math.degrees(lon_rad + math.atan2(
+                cos_lat_sin_d * math.sin(angle), cos_d - sin_lat * sin_new_lat))
+        
+        # Close the ring on the first point
+        coords[n, 0] = coords[0, 0]
+        coords[n, 1] = coords[0, 1]
+        return coords
+else:
+    _circle_coords_numba = None
+
 
 class KMLVolumeService:
     """Service to generate KML volumes for airspaces"""
@@ -28,16 +139,40 @@ class KMLVolumeService:
             db_path = current_dir.parent / "data" / "airspaces.db"
         
         self.db_path = str(db_path)
-        self._validate_database()
+        self._conn = None
+        
+        try:
+            self._validate_database()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Close the database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _validate_database(self):
-        """Validate that the database exists and has required tables"""
+        """Open the connection and validate that the database has the required tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # Single connection reused by every query of this service
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript("""
+                PRAGMA temp_store = MEMORY;
+                PRAGMA mmap_size = 268435456;
+            """)
+            
+            cursor = self._conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
             
             required_tables = ['airspaces', 'airspace_borders', 'border_vertices']
             for table in required_tables:
@@ -46,98 +181,154 @@ class KMLVolumeService:
                     
         except Exception as e:
             raise Exception(f"Database error: {e}")
+        
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        """Create the geometry indexes on databases built before they were added to the extractor"""
+        try:
+            # Same names as aixm_extractor.init_database: no-op on up-to-date databases
+            self._conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_borders_airspace_id ON airspace_borders(airspace_id);
+                CREATE INDEX IF NOT EXISTS idx_vertices_sequence ON border_vertices(border_id, sequence_number);
+            """)
+        except sqlite3.OperationalError:
+            # Read-only database: queries still work, only slower
+            pass
 
     def _get_airspace_geometry(self, airspace_id: int) -> List[Dict]:
         """Get the complete geometry for an airspace"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Get all borders for this airspace
-        cursor.execute("""
-            SELECT * FROM airspace_borders 
-            WHERE airspace_id = ? 
-            ORDER BY id
-        """, (airspace_id,))
+        return self._fetch_geometries(self._conn, [airspace_id]).get(airspace_id, [])
+
+    def _select_airspace_ids(self, conn: sqlite3.Connection, airspace_ids: List[int]) -> Tuple[str, List]:
+        """SQL condition selecting the given airspace ids, with its parameters
         
-        borders = cursor.fetchall()
-        geometry_data = []
+        Small batches use a plain IN list; larger ones are staged in a temporary table
+        to stay under SQLite's parameter limit and avoid parsing a huge statement.
+        """
+        if len(airspace_ids) <= MAX_IN_CLAUSE_IDS:
+            return f"IN ({','.join('?' * len(airspace_ids))})", list(airspace_ids)
+        
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS tmp_airspace_ids (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM tmp_airspace_ids")
+        conn.executemany("INSERT OR IGNORE INTO tmp_airspace_ids VALUES (?)", 
+                         ((airspace_id,) for airspace_id in airspace_ids))
+        return "IN (SELECT id FROM tmp_airspace_ids)", []
+
+    def _fetch_airspaces(self, conn: sqlite3.Connection, airspace_ids: List[int]) -> Dict[int, Dict]:
+        """Get airspace details with altitude information for several airspaces in one query"""
+        id_filter, params = self._select_airspace_ids(conn, airspace_ids)
+        cursor = conn.execute(f"""
+            SELECT a.*, 
+                   vl.lower_limit_ft, vl.upper_limit_ft, 
+                   vl.lower_limit_ref, vl.upper_limit_ref, vl.unit_of_measure
+            FROM airspaces a
+            LEFT JOIN vertical_limits vl ON a.id = vl.airspace_id
+            WHERE a.id {id_filter}
+        """, params)
+        
+        airspaces = {}
+        for row in cursor:
+            # Keep the first vertical limit found for each airspace
+            airspaces.setdefault(row['id'], dict(row))
+        return airspaces
+
+    def _fetch_geometries(self, conn: sqlite3.Connection, airspace_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Get the complete geometry of several airspaces, keyed by airspace id"""
+        id_filter, params = self._select_airspace_ids(conn, airspace_ids)
         
-        for border in borders:
-            border_dict = dict(border)
-            
-            if border_dict['is_circle']:
+        # Get all borders and their vertices in a single query, as plain tuples
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT b.airspace_id, b.id, b.is_circle, 
+                   b.circle_center_lat, b.circle_center_lon, b.circle_radius_km,
+                   v.sequence_number, v.latitude, v.longitude
+            FROM airspace_borders b
+            LEFT JOIN border_vertices v ON v.border_id = b.id
+            WHERE b.airspace_id {id_filter}
+            ORDER BY b.id, v.sequence_number
+        """, params)
+        
+        geometries = {}
+        
+        for _, border_rows in groupby(cursor, key=itemgetter(1)):
+            border_rows = list(border_rows)
+            airspace_id, _, is_circle, center_lat, center_lon, radius_km = border_rows[0][:6]
+            geometry_data = geometries.setdefault(airspace_id, [])
+            
+            if is_circle:
                 # Handle circular boundaries
                 geometry_data.append({
                     'type': 'circle',
-                    'center_lat': border_dict['circle_center_lat'],
-                    'center_lon': border_dict['circle_center_lon'],
-                    'radius_km': border_dict['circle_radius_km']
+                    'center_lat': center_lat,
+                    'center_lon': center_lon,
+                    'radius_km': radius_km
+                })
+            elif border_rows[0][6] is not None:
+                # Vertices of this border (none if the LEFT JOIN found no match),
+                # stored as latitude/longitude arrays
+                geometry_data.append({
+                    'type': 'polygon',
+                    'lat': np.fromiter((row[7] for row in border_rows), 
+                                       dtype=np.float64, count=len(border_rows)),
+                    'lon': np.fromiter((row[8] for row in border_rows), 
+                                       dtype=np.float64, count=len(border_rows))
                 })
-            else:
-                # Get vertices for this border
-                cursor.execute("""
-                    SELECT * FROM border_vertices 
-                    WHERE border_id = ? 
-                    ORDER BY sequence_number
-                """, (border_dict['id'],))
-                
-                vertices = [dict(row) for row in cursor.fetchall()]
-                
-                if vertices:
-                    geometry_data.append({
-                        'type': 'polygon',
-                        'vertices': vertices
-                    })
         
-        conn.close()
-        return geometry_data
+        return geometries
 
     def _convert_altitude_to_meters(self, altitude: Optional[int], unit: Optional[str]) -> Optional[float]:
         """Convert altitude to meters based on unit"""
         if altitude is None or unit is None:
             return None
-            
-        if unit.upper() == 'FT':
-            return altitude * 0.3048  # feet to meters
-        elif unit.upper() == 'M':
-            return float(altitude)
-        elif unit.upper() == 'FL':
-            return altitude * 100 * 0.3048  # flight level (hundreds of feet) to meters
-        else:
-            # Default to feet if unknown unit
-            return altitude * 0.3048
+        
+        factor = UNIT_TO_METERS.get(unit)
+        if factor is None:
+            # Mixed-case units, or default to feet if unknown unit
+            factor = UNIT_TO_METERS.get(unit.upper(), UNIT_TO_METERS['FT'])
+        return altitude * factor
 
     def _generate_circle_coordinates(self, center_lat: float, center_lon: float, 
                                    radius_km: float, num_points: int = 36) -> List[Tuple[float, float]]:
         """Generate coordinates for a circle"""
-        coordinates = []
-        earth_radius = 6371  # km
-        
-        for i in range(num_points + 1):  # +1 to close the polygon
-            angle = 2 * math.pi * i / num_points
-            
-            # Calculate new lat/lon using spherical geometry
-            lat_rad = math.radians(center_lat)
-            lon_rad = math.radians(center_lon)
-            
-            # Bearing calculation
-            new_lat_rad = math.asin(
-                math.sin(lat_rad) * math.cos(radius_km / earth_radius) +
-                math.cos(lat_rad) * math.sin(radius_km / earth_radius) * math.cos(angle)
-            )
-            
-            new_lon_rad = lon_rad + math.atan2(
-                math.sin(angle) * math.sin(radius_km / earth_radius) * math.cos(lat_rad),
-                math.cos(radius_km / earth_radius) - math.sin(lat_rad) * math.sin(new_lat_rad)
-            )
-            
-            coordinates.append((math.degrees(new_lat_rad), math.degrees(new_lon_rad)))
+        if radius_km < FLAT_EARTH_MAX_RADIUS_KM:
+            # Small circles: equirectangular offsets around the center, no trig per point
+            cos_angles, sin_angles = _unit_circle(num_points)
+            dlat = radius_km / KM_PER_DEGREE
+            dlon = radius_km / (KM_PER_DEGREE * math.cos(math.radians(center_lat)))
+            return list(zip((center_lat + dlat * cos_angles).tolist(), 
+                            (center_lon + dlon * sin_angles).tolist()))
+        
+        if _circle_coords_numba is not None:
+            coords = _circle_coords_numba(center_lat, center_lon, radius_km, num_points)
+            return [(lat, lon) for lat, lon in coords.tolist()]
+        
+        # Bearings for every point of the ring, cached per point count
+        cos_angles, sin_angles = _unit_circle(num_points)
+        
+        # Invariant terms, computed once for the whole ring
+        lat_rad = math.radians(center_lat)
+        lon_rad = math.radians(center_lon)
+        d = radius_km / EARTH_RADIUS_KM
+        sin_d, cos_d = math.sin(d), math.cos(d)
+        sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+        sin_lat_cos_d = sin_lat * cos_d
+        cos_lat_sin_d = cos_lat * sin_d
+        
+        # Calculate new lat/lon using spherical geometry, vectorized over all bearings.
+        # sin(new_lat) is the arcsin argument itself, so it is reused instead of recomputed
+        sin_new_lat = sin_lat_cos_d + cos_lat_sin_d * cos_angles
+        new_lat_rad = np.arcsin(sin_new_lat)
+        new_lon_rad = lon_rad + np.arctan2(
+            cos_lat_sin_d * sin_angles,
+            cos_d - sin_lat * sin_new_lat
+        )
         
-        return coordinates
+        return list(zip(np.degrees(new_lat_rad).tolist(), np.degrees(new_lon_rad).tolist()))
 
     def _create_vertical_walls(self, coordinates: List[Tuple[float, float]], 
-                             min_altitude_m: float, max_altitude_m: float) -> List[ET.Element]:
+                             min_altitude_m: float, max_altitude_m: float) -> List[str]:
         """Create vertical wall polygons connecting top and bottom surfaces"""
         walls = []
         
@@ -146,103 +337,58 @@ class KMLVolumeService:
             lat1, lon1 = coordinates[i]
             lat2, lon2 = coordinates[i + 1]
             
-            # Create a wall polygon (rectangular face between two consecutive edge points)
-            wall_polygon = ET.Element('Polygon')
-            wall_altitude_mode = ET.SubElement(wall_polygon, 'altitudeMode')
-            wall_altitude_mode.text = 'absolute'
-            
-            wall_outer_boundary = ET.SubElement(wall_polygon, 'outerBoundaryIs')
-            wall_linear_ring = ET.SubElement(wall_outer_boundary, 'LinearRing')
-            wall_coord_elem = ET.SubElement(wall_linear_ring, 'coordinates')
-            
             # Create wall coordinates (4 corners of rectangular wall)
             # Bottom-left, Bottom-right, Top-right, Top-left, Bottom-left (to close)
             wall_coords = [
-                f"{lon1},{lat1},{min_altitude_m}",  # Bottom-left
-                f"{lon2},{lat2},{min_altitude_m}",  # Bottom-right  
-                f"{lon2},{lat2},{max_altitude_m}",  # Top-right
-                f"{lon1},{lat1},{max_altitude_m}",  # Top-left
-                f"{lon1},{lat1},{min_altitude_m}"   # Close the polygon
+                COORDINATE_FORMAT % (lon1, lat1, min_altitude_m),  # Bottom-left
+                COORDINATE_FORMAT % (lon2, lat2, min_altitude_m),  # Bottom-right  
+                COORDINATE_FORMAT % (lon2, lat2, max_altitude_m),  # Top-right
+                COORDINATE_FORMAT % (lon1, lat1, max_altitude_m),  # Top-left
+                COORDINATE_FORMAT % (lon1, lat1, min_altitude_m)   # Close the polygon
             ]
             
-            wall_coord_elem.text = ' '.join(wall_coords)
-            walls.append(wall_polygon)
+            # Create a wall polygon (rectangular face between two consecutive edge points)
+            walls.append(self._polygon_kml(' '.join(wall_coords)))
             
         return walls
 
+    def _polygon_kml(self, coordinates_text: str, extrude: bool = False) -> str:
+        """KML Polygon with an absolute altitude mode and a single outer boundary"""
+        return _POLYGON_TEMPLATE.format_map({
+            'extrude': _EXTRUDE_TAG if extrude else "",
+            'coordinates': coordinates_text,
+        })
+
     def _create_kml_polygon(self, coordinates: List[Tuple[float, float]], 
                            min_altitude_m: Optional[float], max_altitude_m: Optional[float],
                            name: str, description: str, 
-                           airspace_type: str = None, airspace_class: str = None) -> ET.Element:
-        """Create a KML polygon element with altitude extrusion"""
+                           airspace_type: str = None, airspace_class: str = None) -> str:
+        """Create a KML polygon placemark with altitude extrusion"""
         
-        # Create Placemark
-        placemark = ET.Element('Placemark')
-        
-        # Add name
-        name_elem = ET.SubElement(placemark, 'name')
-        name_elem.text = name
-        
-        # Add description
-        desc_elem = ET.SubElement(placemark, 'description')
-        desc_elem.text = description
+        out = []
         
         # Create Polygon or MultiGeometry for proper 3D volume representation
         if (min_altitude_m is not None and max_altitude_m is not None and 
             max_altitude_m > min_altitude_m):
             # Create MultiGeometry with top and bottom surfaces plus vertical walls for elevated airspace
-            multigeometry = ET.SubElement(placemark, 'MultiGeometry')
+            out.append("<MultiGeometry>")
             
             # Top surface at max altitude
-            top_polygon = ET.SubElement(multigeometry, 'Polygon')
-            top_altitude_mode = ET.SubElement(top_polygon, 'altitudeMode')
-            top_altitude_mode.text = 'absolute'
-            top_outer_boundary = ET.SubElement(top_polygon, 'outerBoundaryIs')
-            top_linear_ring = ET.SubElement(top_outer_boundary, 'LinearRing')
-            top_coord_elem = ET.SubElement(top_linear_ring, 'coordinates')
-            top_coord_text = []
-            for lat, lon in coordinates:
-                top_coord_text.append(f"{lon},{lat},{max_altitude_m}")
-            top_coord_elem.text = ' '.join(top_coord_text)
+            top_coord_text = ' '.join(COORDINATE_FORMAT % (lon, lat, max_altitude_m) for lat, lon in coordinates)
+            out.append(self._polygon_kml(top_coord_text))
             
-            # Bottom surface at min altitude  
-            bottom_polygon = ET.SubElement(multigeometry, 'Polygon')
-            bottom_altitude_mode = ET.SubElement(bottom_polygon, 'altitudeMode')
-            bottom_altitude_mode.text = 'absolute'
-            bottom_outer_boundary = ET.SubElement(bottom_polygon, 'outerBoundaryIs')
-            bottom_linear_ring = ET.SubElement(bottom_outer_boundary, 'LinearRing')
-            bottom_coord_elem = ET.SubElement(bottom_linear_ring, 'coordinates')
-            bottom_coord_text = []
-            # Reverse coordinate order for bottom surface (proper winding)
-            for lat, lon in reversed(coordinates):
-                bottom_coord_text.append(f"{lon},{lat},{min_altitude_m}")
-            bottom_coord_elem.text = ' '.join(bottom_coord_text)
+            # Bottom surface at min altitude, reverse coordinate order (proper winding)
+            bottom_coord_text = ' '.join(COORDINATE_FORMAT % (lon, lat, min_altitude_m) for lat, lon in reversed(coordinates))
+            out.append(self._polygon_kml(bottom_coord_text))
             
             # Add vertical walls connecting top and bottom surfaces
-            wall_polygons = self._create_vertical_walls(coordinates, min_altitude_m, max_altitude_m)
-            for wall in wall_polygons:
-                multigeometry.append(wall)
+            out.extend(self._create_vertical_walls(coordinates, min_altitude_m, max_altitude_m))
+            out.append("</MultiGeometry>")
             
         else:
             # Use traditional extrusion for ground-based or single-altitude airspaces
-            polygon = ET.SubElement(placemark, 'Polygon')
-            
-            # Set altitude mode and extrusion
-            altitude_mode = ET.SubElement(polygon, 'altitudeMode')
-            altitude_mode.text = 'absolute'
-            
             # Enable extrusion if we have a maximum altitude
-            if max_altitude_m is not None and max_altitude_m > 0:
-                extrude = ET.SubElement(polygon, 'extrude')
-                extrude.text = '1'
-            
-            # Create outer boundary
-            outer_boundary = ET.SubElement(polygon, 'outerBoundaryIs')
-            linear_ring = ET.SubElement(outer_boundary, 'LinearRing')
-            
-            # Add coordinates - use max altitude for extrusion, or min altitude if no max
-            coord_elem = ET.SubElement(linear_ring, 'coordinates')
-            coord_text = []
+            extrude = max_altitude_m is not None and max_altitude_m > 0
             
             # Determine the altitude to use for coordinates
             if max_altitude_m is not None and max_altitude_m > 0:
@@ -252,68 +398,74 @@ class KMLVolumeService:
             else:
                 coordinate_altitude = 0.0
             
-            for lat, lon in coordinates:
-                coord_text.append(f"{lon},{lat},{coordinate_altitude}")
-            
-            coord_elem.text = ' '.join(coord_text)
+            # Add coordinates - use max altitude for extrusion, or min altitude if no max
+            coord_text = ' '.join(COORDINATE_FORMAT % (lon, lat, coordinate_altitude) for lat, lon in coordinates)
+            out.append(self._polygon_kml(coord_text, extrude))
+        
+        # Placemark with name, description and its shared document style
+        return _PLACEMARK_TEMPLATE.format_map({
+            'name': escape(name),
+            'description': escape(description),
+            'style_id': self._style_id(get_airspace_color(airspace_type, airspace_class)),
+            'geometry': "\n".join(out),
+        })
+
+    def _style_id(self, fill_color: str) -> str:
+        """Id of the document-level style shared by airspaces with this fill color"""
+        return f"airspace-{fill_color}"
+
+    def _create_airspace_styles(self, airspaces: List[Dict]) -> List[str]:
+        """Create one document-level Style per distinct airspace color, referenced by styleUrl"""
+        fill_colors = sorted({get_airspace_color(airspace.get('code_type'), airspace.get('airspace_class')) 
+                              for airspace in airspaces})
         
         # Add style for visualization using color configuration
-        fill_color = get_airspace_color(airspace_type, airspace_class)
-        line_color = get_line_color(fill_color)
-        
-        style = ET.SubElement(placemark, 'Style')
-        poly_style = ET.SubElement(style, 'PolyStyle')
-        
-        color_elem = ET.SubElement(poly_style, 'color')
-        color_elem.text = fill_color
-        
-        fill_elem = ET.SubElement(poly_style, 'fill')
-        fill_elem.text = '1'
-        
-        outline_elem = ET.SubElement(poly_style, 'outline')
-        outline_elem.text = '1'
-        
-        line_style = ET.SubElement(style, 'LineStyle')
-        line_color_elem = ET.SubElement(line_style, 'color')
-        line_color_elem.text = line_color
-        line_width_elem = ET.SubElement(line_style, 'width')
-        line_width_elem.text = str(LINE_WIDTH)
-        
-        return placemark
+        return [
+            _STYLE_TEMPLATE.format_map({
+                'style_id': self._style_id(fill_color),
+                'fill': fill_color,
+                'line': get_line_color(fill_color),
+                'width': LINE_WIDTH,
+            })
+            for fill_color in fill_colors
+        ]
 
     def generate_airspace_kml(self, airspace_id: int) -> str:
         """Generate KML for a specific airspace"""
-        # Get airspace details with altitude information
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        # Get airspace details with altitude information and geometry, as in the multi-airspace path
+        loaded_airspaces = self._load_airspaces(self._conn, [airspace_id])
         
-        cursor.execute("""
-            SELECT a.*, 
-                   vl.lower_limit_ft, vl.upper_limit_ft, 
-                   vl.lower_limit_ref, vl.upper_limit_ref, vl.unit_of_measure
-            FROM airspaces a
-            LEFT JOIN vertical_limits vl ON a.id = vl.airspace_id
-            WHERE a.id = ?
-        """, (airspace_id,))
-        airspace_row = cursor.fetchone()
-        
-        if not airspace_row:
+        if airspace_id not in loaded_airspaces:
             raise ValueError(f"Airspace with ID {airspace_id} not found")
         
-        airspace = dict(airspace_row)
-        conn.close()
-        
-        # Convert altitudes to meters for coordinates
-        min_altitude_m = self._convert_altitude_to_meters(
-            airspace.get('lower_limit_ft'), 
-            airspace.get('lower_limit_ref')
-        )
-        max_altitude_m = self._convert_altitude_to_meters(
-            airspace.get('upper_limit_ft'), 
-            airspace.get('upper_limit_ref')
-        )
+        airspace, geometry_data = loaded_airspaces[airspace_id]
+        placemarks = self._build_placemarks(airspace, geometry_data)
+        min_alt_display, max_alt_display = self._format_altitude_limits(airspace)
         
+        # Create KML document with name and description
+        doc_name = f"Airspace: {airspace.get('name', 'Unknown')}"
+        description = f"""
+        Airspace Volume: {airspace.get('name', 'Unknown')}
+        Class: {airspace.get('airspace_class', 'Unknown')}
+        Type: {airspace.get('code_type', 'Unknown')}
+        Min Altitude: {min_alt_display}
+        Max Altitude: {max_alt_display}
+        """
+        out = [
+            KML_HEADER,
+            "<Document>",
+            f"<name>{escape(doc_name)}</name>",
+            f"<description>{escape(description)}</description>"
+        ]
+        out.extend(self._create_airspace_styles([airspace]))
+        out.extend(placemarks)
+        out.append("</Document>")
+        out.append(KML_FOOTER)
+        
+        return "\n".join(out)
+
+    def _format_altitude_limits(self, airspace: Dict) -> Tuple[str, str]:
+        """Readable lower/upper altitude limits of an airspace"""
         # Create readable altitude strings for display
         min_alt_display = "Surface"
         max_alt_display = "Unlimited"
@@ -330,28 +482,25 @@ class KMLVolumeService:
             else:
                 max_alt_display = f"{airspace.get('upper_limit_ft')} {airspace.get('upper_limit_ref', 'FT')}"
         
-        # Get geometry
-        geometry_data = self._get_airspace_geometry(airspace_id)
-        
+        return min_alt_display, max_alt_display
+
+    def _build_placemarks(self, airspace: Dict, geometry_data: List[Dict]) -> List[str]:
+        """Create the volume placemarks of an airspace from its geometry"""
         if not geometry_data:
-            raise ValueError(f"No geometry found for airspace {airspace_id}")
-        
-        # Create KML document
-        kml = ET.Element('kml', xmlns="http://www.opengis.net/kml/2.2")
-        document = ET.SubElement(kml, 'Document')
+            raise ValueError(f"No geometry found for airspace {airspace['id']}")
         
-        # Add document name and description
-        doc_name = ET.SubElement(document, 'name')
-        doc_name.text = f"Airspace: {airspace.get('name', 'Unknown')}"
+        # Convert altitudes to meters for coordinates
+        min_altitude_m = self._convert_altitude_to_meters(
+            airspace.get('lower_limit_ft'), 
+            airspace.get('lower_limit_ref')
+        )
+        max_altitude_m = self._convert_altitude_to_meters(
+            airspace.get('upper_limit_ft'), 
+            airspace.get('upper_limit_ref')
+        )
         
-        doc_desc = ET.SubElement(document, 'description')
-        doc_desc.text = f"""
-        Airspace Volume: {airspace.get('name', 'Unknown')}
-        Class: {airspace.get('airspace_class', 'Unknown')}
-        Type: {airspace.get('code_type', 'Unknown')}
-        Min Altitude: {min_alt_display}
-        Max Altitude: {max_alt_display}
-        """
+        min_alt_display, max_alt_display = self._format_altitude_limits(airspace)
+        placemarks = []
         
         # Process each geometry component
         for i, geom in enumerate(geometry_data):
@@ -385,43 +534,32 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL"""
                     airspace.get('airspace_class')
                 )
                 
-                document.append(placemark)
-                
-            elif geom['type'] == 'polygon' and geom.get('vertices'):
-                coordinates = []
-                longitudes = []
-                latitudes = []
+                placemarks.append(placemark)
                 
-                for vertex in geom['vertices']:
-                    lat, lon = vertex['latitude'], vertex['longitude']
-                    coordinates.append((lat, lon))
-                    longitudes.append(lon)
-                    latitudes.append(lat)
+            elif geom['type'] == 'polygon' and len(geom['lat']):
+                latitudes, longitudes = geom['lat'], geom['lon']
                 
                 # Initialize geometry note
                 geometry_note = ""
                 
                 # Validate geometry - check for suspicious outliers
                 if len(longitudes) > 3:
-                    import statistics
-                    lon_median = statistics.median(longitudes)
-                    lat_median = statistics.median(latitudes)
+                    lon_median = np.median(longitudes)
+                    lat_median = np.median(latitudes)
                     
                     # Flag vertices that are more than 1 degree from median
-                    outliers = []
-                    filtered_coords = []
-                    for i, (lat, lon) in enumerate(coordinates):
-                        if abs(lon - lon_median) > 1.0 or abs(lat - lat_median) > 0.5:
-                            outliers.append(f"({lon:.3f}, {lat:.3f})")
-                        else:
-                            filtered_coords.append((lat, lon))
+                    outliers = (np.abs(longitudes - lon_median) > 1.0) | (np.abs(latitudes - lat_median) > 0.5)
+                    outlier_count = int(outliers.sum())
+                    kept_count = len(longitudes) - outlier_count
                     
                     # If we have significant outliers, mention it in description
-                    if outliers and len(filtered_coords) >= 3:
-                        geometry_note = f"\nNote: {len(outliers)} outlier vertices excluded from geometry"
-                        coordinates = filtered_coords  # Use filtered coordinates
-                    elif outliers:
-                        geometry_note = f"\nWarning: Geometry contains {len(outliers)} suspicious vertices"
+                    if outlier_count and kept_count >= 3:
+                        geometry_note = f"\nNote: {outlier_count} outlier vertices excluded from geometry"
+                        latitudes, longitudes = latitudes[~outliers], longitudes[~outliers]  # Use filtered coordinates
+                    elif outlier_count:
+                        geometry_note = f"\nWarning: Geometry contains {outlier_count} suspicious vertices"
+                
+                coordinates = list(zip(latitudes.tolist(), longitudes.tolist()))
                 
                 # Close the polygon if not already closed
                 if coordinates and coordinates[0] != coordinates[-1]:
@@ -450,11 +588,24 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL{geometry_note}"""
                     airspace.get('airspace_class')
                 )
                 
-                document.append(placemark)
+                placemarks.append(placemark)
         
-        # Convert to string
-        ET.indent(kml, space="  ")
-        return ET.tostring(kml, encoding='unicode')
+        return placemarks
+
+    def _load_airspaces(self, conn: sqlite3.Connection, 
+                        airspace_ids: List[int]) -> Dict[int, Tuple[Dict, List[Dict]]]:
+        """Load several airspaces and their geometry with two batched queries
+        
+        Returns:
+            Dict mapping each airspace id found to (airspace, geometry_data)
+        """
+        # Single transaction for the temporary id tables of large batches
+        with conn:
+            airspaces = self._fetch_airspaces(conn, airspace_ids)
+            geometries = self._fetch_geometries(conn, list(airspaces))
+        
+        return {airspace_id: (airspace, geometries.get(airspace_id, [])) 
+                for airspace_id, airspace in airspaces.items()}
 
     def generate_multiple_airspaces_kml(self, airspace_ids: List[int], flight_name: str = None, 
                                       flight_coordinates: List[tuple] = None,
@@ -469,41 +620,121 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL{geometry_note}"""
             flight_waypoints: List of (name, lon, lat, alt_ft) tuples for waypoint names
             show_intermediate_points: Whether to show intermediate climb/descent points
         """
-        # Create KML document
-        kml = ET.Element('kml', xmlns="http://www.opengis.net/kml/2.2")
-        document = ET.SubElement(kml, 'Document')
+        return "\n".join(self._iter_multiple_airspaces_kml(
+            airspace_ids, flight_name, flight_coordinates, flight_waypoints, show_intermediate_points
+        ))
+
+    def generate_multiple_airspaces_kml_parallel(self, airspace_ids: List[int], flight_name: str = None, 
+                                               flight_coordinates: List[tuple] = None,
+                                               flight_waypoints: List[tuple] = None, 
+                                               show_intermediate_points: bool = False,
+                                               workers: int = None) -> str:
+        """Generate KML for multiple airspaces, building the airspace placemarks in a process pool
+        
+        Same output as generate_multiple_airspaces_kml; each worker process opens its own
+        connection to the database. Worth it only when building placemarks dominates, e.g.
+        batches of several thousand airspaces from a database larger than the French one:
+        for a single flight (tens of airspaces), and even for the whole bundled database,
+        process start-up costs more than it saves and generate_multiple_airspaces_kml or
+        save_multiple_airspaces_kml are faster. The application's commands use those.
+        
+        Callers must run under an ``if __name__ == "__main__":`` guard, and frozen
+        executables must call multiprocessing.freeze_support() first (navpro.py and
+        navpro_gui.py do), otherwise on Windows each worker relaunches the application.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+        """
+        unique_ids = list(dict.fromkeys(airspace_ids))
+        workers = workers or os.cpu_count() or 1
+        
+        # A few chunks per worker to balance airspaces of very different sizes
+        chunk_size = max(1, math.ceil(len(unique_ids) / (workers * 4)))
+        chunks = [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+        
+        prebuilt = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for results in executor.map(_build_placemarks_worker, [self.db_path] * len(chunks), chunks):
+                prebuilt.update(results)
+        
+        return "\n".join(self._iter_multiple_airspaces_kml(
+            airspace_ids, flight_name, flight_coordinates, flight_waypoints, show_intermediate_points, prebuilt
+        ))
+
+    def save_multiple_airspaces_kml(self, airspace_ids: List[int], output_path: str, flight_name: str = None, 
+                                    flight_coordinates: List[tuple] = None,
+                                    flight_waypoints: List[tuple] = None, 
+                                    show_intermediate_points: bool = False) -> str:
+        """Generate and save KML for multiple airspaces, writing each placemark as soon as it is built
+        
+        Args:
+            airspace_ids: List of airspace IDs to include
+            flight_name: Name of the flight path for document title
+            flight_coordinates: List of (lon, lat, alt_ft) tuples for original flight path
+            flight_waypoints: List of (name, lon, lat, alt_ft) tuples for waypoint names
+            show_intermediate_points: Whether to show intermediate climb/descent points
+            output_path: Path of the KML file to write
+        """
+        with open(output_path, 'wb') as f:
+            f.write(XML_DECLARATION)
+            for chunk in self._iter_multiple_airspaces_kml(
+                    airspace_ids, flight_name, flight_coordinates, flight_waypoints, show_intermediate_points):
+                f.write(chunk.encode('utf-8'))
+                f.write(b"\n")
         
-        # Add document name - use flight name if provided
-        doc_name = ET.SubElement(document, 'name')
+        return output_path
+
+    def _iter_multiple_airspaces_kml(self, airspace_ids: List[int], flight_name: str = None, 
+                                     flight_coordinates: List[tuple] = None,
+                                     flight_waypoints: List[tuple] = None, 
+                                     show_intermediate_points: bool = False,
+                                     prebuilt: Dict[int, object] = None) -> Iterator[str]:
+        """Yield the lines of the multiple airspaces KML document (see generate_multiple_airspaces_kml)
+        
+        prebuilt maps airspace ids to (airspace row, has geometry, placemarks or the exception
+        raised building them), as returned by the worker processes; nothing is reloaded then
+        """
+        # Create KML document with its name - use flight name if provided
         if flight_name:
-            doc_name.text = f"{flight_name} - Airspace Profile ({len(airspace_ids)} airspaces)"
+            doc_name = f"{flight_name} - Airspace Profile ({len(airspace_ids)} airspaces)"
+        else:
+            doc_name = f"Multiple Airspaces ({len(airspace_ids)} airspaces)"
+        yield KML_HEADER
+        yield "<Document>"
+        yield f"<name>{escape(doc_name)}</name>"
+        
+        if prebuilt is None:
+            # Get airspace details and geometry for all airspaces in batched queries
+            loaded_airspaces = self._load_airspaces(self._conn, airspace_ids)
         else:
-            doc_name.text = f"Multiple Airspaces ({len(airspace_ids)} airspaces)"
+            # Rows loaded by the workers; only whether a geometry exists is needed here
+            loaded_airspaces = {airspace_id: (row, has_geometry) 
+                                for airspace_id, (row, has_geometry, _) in prebuilt.items()}
         
         # Group airspaces by type
         airspaces_by_type = {}
         
-        # Get airspace details to group by type
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
         for airspace_id in airspace_ids:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM airspaces WHERE id = ?", (airspace_id,))
-            row = cursor.fetchone()
+            if airspace_id not in loaded_airspaces:
+                continue
             
-            if row:
-                airspace_type = row['code_type'].upper() if row['code_type'] else 'OTHER'
-                if airspace_type not in airspaces_by_type:
-                    airspaces_by_type[airspace_type] = []
-                airspaces_by_type[airspace_type].append({
-                    'id': airspace_id,
-                    'name': row['name'] if row['name'] else 'Unknown',
-                    'type': airspace_type,
-                    'class': row['airspace_class'] if row['airspace_class'] else 'UNKNOWN'
-                })
-        
-        conn.close()
+            row, geometry_data = loaded_airspaces[airspace_id]
+            airspace_type = row['code_type'].upper() if row['code_type'] else 'OTHER'
+            if airspace_type not in airspaces_by_type:
+                airspaces_by_type[airspace_type] = []
+            airspaces_by_type[airspace_type].append({
+                'id': airspace_id,
+                'name': row['name'] if row['name'] else 'Unknown',
+                'type': airspace_type,
+                'class': row['airspace_class'] if row['airspace_class'] else 'UNKNOWN',
+                'airspace': row,
+                'geometry': geometry_data
+            })
+        
+        # Shared styles of the airspaces with a geometry, referenced by their placemarks
+        yield from self._create_airspace_styles(
+            [row for row, geometry_data in loaded_airspaces.values() if geometry_data]
+        )
         
         # Create KML folders for each airspace type
         type_order = ['CTR', 'TMA', 'RAS', 'R', 'D', 'P', 'SECTOR', 'FIR', 'OTHER']
@@ -515,36 +746,35 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL{geometry_note}"""
             airspaces = airspaces_by_type[airspace_type]
             
             # Create folder for this type
-            folder = ET.SubElement(document, 'Folder')
+            yield "<Folder>"
             
             # Folder name with emoji and count
-            folder_name = ET.SubElement(folder, 'name')
             type_emoji = {
                 'CTR': '🏢', 'TMA': '🛬', 'RAS': '📡', 'R': '⛔', 
                 'D': '🚫', 'P': '🔒', 'SECTOR': '📶', 'FIR': '🌍', 'OTHER': '❓'
             }
             emoji = type_emoji.get(airspace_type, '❓')
-            folder_name.text = f"{emoji} {airspace_type} ({len(airspaces)} airspaces)"
+            yield f"<name>{escape(f'{emoji} {airspace_type} ({len(airspaces)} airspaces)')}</name>"
             
             # Folder description
-            folder_desc = ET.SubElement(folder, 'description')
-            folder_desc.text = f"{airspace_type} airspaces encountered along flight path"
+            yield f"<description>{escape(airspace_type)} airspaces encountered along flight path</description>"
             
-            # Add each airspace to this folder
+            # Add each airspace to this folder, built only when it is written
             for airspace in airspaces:
                 try:
-                    single_kml_str = self.generate_airspace_kml(airspace['id'])
-                    single_kml = ET.fromstring(single_kml_str)
-                    
-                    # Extract placemarks from single KML
-                    single_doc = single_kml.find('.//{http://www.opengis.net/kml/2.2}Document')
-                    if single_doc is not None:
-                        for placemark in single_doc.findall('.//{http://www.opengis.net/kml/2.2}Placemark'):
-                            folder.append(placemark)
-                            
+                    if prebuilt is not None:
+                        # Built by a worker process: placemarks or the error it raised
+                        placemarks = prebuilt[airspace['id']][2]
+                        if isinstance(placemarks, Exception):
+                            raise placemarks
+                    else:
+                        placemarks = self._build_placemarks(airspace['airspace'], airspace['geometry'])
                 except Exception as e:
                     print(f"Warning: Failed to generate KML for airspace {airspace['id']} ({airspace['name']}): {e}")
                     continue
+                yield from placemarks
+            
+            yield "</Folder>"
         
         # Add flight path at the top level if coordinates are provided
         if flight_coordinates or flight_waypoints:
@@ -571,128 +801,98 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL{geometry_note}"""
                 waypoints_to_use = filtered_waypoints
                 # coords_to_use remains unchanged to preserve complete flight path with intermediate points
             
-            self._add_flight_path_to_kml(document, coords_to_use, flight_name or "Flight Path", waypoints_to_use)
+            flight_path = []
+            self._add_flight_path_to_kml(flight_path, coords_to_use, flight_name or "Flight Path", waypoints_to_use)
+            yield from flight_path
         
-        # Convert to string
-        ET.indent(kml, space="  ")
-        return ET.tostring(kml, encoding='unicode')
+        yield "</Document>"
+        yield KML_FOOTER
 
-    def _add_flight_path_to_kml(self, document: ET.Element, flight_coordinates: List[tuple], 
+    def _add_flight_path_to_kml(self, out: List[str], flight_coordinates: List[tuple], 
                               flight_name: str, flight_waypoints: List[tuple] = None):
         """Add flight path LineString and waypoints to KML document with corrected KML styling
         
         Args:
+            out: KML document lines the flight path is appended to
             flight_coordinates: List of (lon, lat, alt_ft) tuples for route line
             flight_waypoints: List of (name, lon, lat, alt_ft) tuples for waypoint names
         """
         
         # Add styles first (yellow line and waypoint styles)
-        self._add_flight_path_styles(document)
+        self._add_flight_path_styles(out)
         
         # Create flight path folder
-        flight_folder = ET.SubElement(document, 'Folder')
-        folder_name = ET.SubElement(flight_folder, 'name')
-        folder_name.text = f"✈️ {flight_name} Route"
-        folder_desc = ET.SubElement(flight_folder, 'description')
-        folder_desc.text = f"Flight route with {len(flight_coordinates)} waypoints"
-        
-        # Create flight path placemark (yellow line)
-        placemark = ET.SubElement(flight_folder, 'Placemark')
-        
-        # Name
-        name = ET.SubElement(placemark, 'name')
-        name.text = flight_name
-        
-        # Description
-        desc = ET.SubElement(placemark, 'description')
-        desc.text = "Flight route"
-        
-        # Use yellow line style
-        style_url = ET.SubElement(placemark, 'styleUrl')
-        style_url.text = "#msn_ylw-line"
-        
-        # Create LineString geometry
-        linestring = ET.SubElement(placemark, 'LineString')
-        extrude = ET.SubElement(linestring, 'extrude')
-        extrude.text = "1"
-        tessellate = ET.SubElement(linestring, 'tessellate')
-        tessellate.text = "1"
-        altitude_mode = ET.SubElement(linestring, 'altitudeMode')
-        altitude_mode.text = "absolute"
-        
-        # Build coordinates string: lon,lat,alt_meters 
-        coordinates = ET.SubElement(linestring, 'coordinates')
-        coord_strings = []
-        for lon, lat, alt_ft in flight_coordinates:
-            # Convert altitude from feet to meters for KML
-            alt_m = alt_ft / 3.28084
-            coord_strings.append(f"{lon},{lat},{alt_m}")
-        
-        coordinates.text = " ".join(coord_strings)
+        out.append("<Folder>")
+        out.append(f"<name>{escape(f'✈️ {flight_name} Route')}</name>")
+        out.append(f"<description>Flight route with {len(flight_coordinates)} waypoints</description>")
+        
+        # Build coordinates string: lon,lat,alt_meters (altitude converted from feet for KML)
+        coordinates_text = " ".join(f"{lon},{lat},{alt_ft / 3.28084}" for lon, lat, alt_ft in flight_coordinates)
+        
+        # Create flight path placemark (yellow line) with LineString geometry
+        out.append(
+            "<Placemark>\n"
+            f"<name>{escape(flight_name)}</name>\n"
+            "<description>Flight route</description>\n"
+            "<styleUrl>#msn_ylw-line</styleUrl>\n"
+            "<LineString>\n<extrude>1</extrude>\n<tessellate>1</tessellate>\n<altitudeMode>absolute</altitudeMode>\n"
+            f"<coordinates>{coordinates_text}</coordinates>\n"
+            "</LineString>\n"
+            "</Placemark>"
+        )
         
         # Add waypoint placemarks
         waypoints_to_display = flight_waypoints if flight_waypoints else [(f"WP{i+1:02d}", lon, lat, alt_ft) for i, (lon, lat, alt_ft) in enumerate(flight_coordinates)]
         
         for name, lon, lat, alt_ft in waypoints_to_display:
-            waypoint_placemark = ET.SubElement(flight_folder, 'Placemark')
-            
-            # Use the actual waypoint name from corrected profile
-            wp_name = ET.SubElement(waypoint_placemark, 'name')
-            wp_name.text = name
-            
-            wp_desc = ET.SubElement(waypoint_placemark, 'description')
-            wp_desc.text = f"{name} - {int(alt_ft)} ft"
-            
-            # Use yellow pushpin style
-            wp_style_url = ET.SubElement(waypoint_placemark, 'styleUrl')
-            wp_style_url.text = "#msn_ylw-pushpin"
-            
-            # Create Point geometry
-            point = ET.SubElement(waypoint_placemark, 'Point')
-            point_extrude = ET.SubElement(point, 'extrude')
-            point_extrude.text = "1"
-            point_alt_mode = ET.SubElement(point, 'altitudeMode')
-            point_alt_mode.text = "absolute"
-            
-            point_coords = ET.SubElement(point, 'coordinates')
+            # Use the actual waypoint name from corrected profile, yellow pushpin style
             alt_m = alt_ft / 3.28084
-            point_coords.text = f"{lon},{lat},{alt_m}"
+            out.append(
+                "<Placemark>\n"
+                f"<name>{escape(name)}</name>\n"
+                f"<description>{escape(name)} - {int(alt_ft)} ft</description>\n"
+                "<styleUrl>#msn_ylw-pushpin</styleUrl>\n"
+                "<Point>\n<extrude>1</extrude>\n<altitudeMode>absolute</altitudeMode>\n"
+                f"<coordinates>{lon},{lat},{alt_m}</coordinates>\n"
+                "</Point>\n"
+                "</Placemark>"
+            )
+        
+        out.append("</Folder>")
     
-    def _add_flight_path_styles(self, document: ET.Element):
+    def _add_flight_path_styles(self, out: List[str]):
         """Add yellow line and pushpin styles for flight path"""
-        # Yellow line style
-        line_style = ET.SubElement(document, 'Style', id="msn_ylw-line")
-        line_style_line = ET.SubElement(line_style, 'LineStyle')
-        line_color = ET.SubElement(line_style_line, 'color')
-        line_color.text = "ff00ffff"  # Yellow in KML AABBGGRR format
-        line_width = ET.SubElement(line_style_line, 'width')
-        line_width.text = "3"
-        
-        # Yellow pushpin style  
-        pushpin_style = ET.SubElement(document, 'Style', id="msn_ylw-pushpin")
-        pushpin_icon_style = ET.SubElement(pushpin_style, 'IconStyle')
-        pushpin_scale = ET.SubElement(pushpin_icon_style, 'scale')
-        pushpin_scale.text = "1.1"
-        pushpin_icon = ET.SubElement(pushpin_icon_style, 'Icon')
-        pushpin_href = ET.SubElement(pushpin_icon, 'href')
-        pushpin_href.text = "http://maps.google.com/mapfiles/kml/pushpin/ylw-pushpin.png"
-        pushpin_hotspot = ET.SubElement(pushpin_icon_style, 'hotSpot', x="20", y="2", xunits="pixels", yunits="pixels")
+        # Yellow line style (ff00ffff is yellow in KML AABBGGRR format)
+        out.append(
+            '<Style id="msn_ylw-line">\n'
+            "<LineStyle>\n<color>ff00ffff</color>\n<width>3</width>\n</LineStyle>\n"
+            "</Style>"
+        )
+        
+        # Yellow pushpin style
+        out.append(
+            '<Style id="msn_ylw-pushpin">\n'
+            "<IconStyle>\n<scale>1.1</scale>\n"
+            "<Icon>\n<href>http://maps.google.com/mapfiles/kml/pushpin/ylw-pushpin.png</href>\n</Icon>\n"
+            '<hotSpot x="20" y="2" xunits="pixels" yunits="pixels" />\n'
+            "</IconStyle>\n"
+            "</Style>"
+        )
 
     def save_airspace_kml(self, airspace_id: int, output_path: str) -> str:
         """Generate and save KML file for an airspace"""
         kml_content = self.generate_airspace_kml(airspace_id)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write(kml_content)
+        # Single UTF-8 encode pass, no text-mode wrapper in between
+        with open(output_path, 'wb') as f:
+            f.write(XML_DECLARATION)
+            f.write(kml_content.encode('utf-8'))
         
         return output_path
 
     def get_airspace_by_name(self, name_pattern: str) -> List[Dict]:
         """Get airspace details by name pattern"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         # Prioritize airspaces with known classes over UNKNOWN classes
         # This helps avoid duplicates where same airspace exists with and without class info
@@ -723,5 +923,23 @@ Altitude range: {min_alt_display} - {max_alt_display} AMSL{geometry_note}"""
                 filtered_results.append(result)
                 seen_combinations.add(key)
         
-        conn.close()
-        return filtered_results
\ No newline at end of file
+        return filtered_results
+
+
+@lru_cache(maxsize=1)
+def _worker_service(db_path: str) -> KMLVolumeService:
+    """KML service of a worker process, opened once per database"""
+    return KMLVolumeService(db_path)
+
+
+def _build_placemarks_worker(db_path: str, airspace_ids: List[int]) -> Dict[int, object]:
+    """Process pool task: (airspace row, has geometry, placemarks or the exception raised) per airspace"""
+    service = _worker_service(db_path)
+    results = {}
+    for airspace_id, (airspace, geometry_data) in service._load_airspaces(service._conn, airspace_ids).items():
+        try:
+            placemarks = service._build_placemarks(airspace, geometry_data)
+        except Exception as e:
+            placemarks = e
+        results[airspace_id] = (airspace, bool(geometry_data), placemarks)
+    return results
@@ -4,9 +4,37 @@ Module utilitaire pour les conversions d'unités et l'API d'élévation
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import math
-from typing import Optional, Dict, Tuple
+import numpy as np
+from typing import Optional, Dict, List, Tuple
 import time
+import os
+import shelve
+from functools import lru_cache
+
+# pyproj facultatif : géodésiques sur l'ellipsoïde WGS84 (code C), sinon haversine sphérique
+try:
+    from pyproj import Geod
+    _GEOD = Geod(ellps='WGS84')
+except ImportError:
+    _GEOD = None
+
+# Pieds par mètre ; multiplier directement évite un appel de méthode dans les boucles
+FEET_PER_METER = 3.28084
+
+# Même facteur que math.radians, appliqué par simple multiplication
+DEG_TO_RAD = math.pi / 180.0
+
+# Cache disque des altitudes terrain, partagé entre les exécutions
+ELEVATION_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'nav-profile', 'elevations')
+
+# Précision des clés de cache (4 décimales ≈ 11 m, bien en deçà de la résolution des MNT)
+ELEVATION_CACHE_DECIMALS = 4
+
+# Session HTTP partagée : la connexion TLS (keep-alive) est réutilisée d'une requête à l'autre
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 
 class UnitConverter:
@@ -15,12 +43,12 @@ class UnitConverter:
     @staticmethod
     def meters_to_feet(meters: float) -> float:
         """Convertit des mètres en pieds"""
-        return meters * 3.28084
+        return meters * FEET_PER_METER
     
     @staticmethod
     def feet_to_meters(feet: float) -> float:
         """Convertit des pieds en mètres"""
-        return feet / 3.28084
+        return feet / FEET_PER_METER
     
     @staticmethod
     def km_to_nautical_miles(km: float) -> float:
@@ -33,8 +61,62 @@ class UnitConverter:
         return nm * 1.852
     
     @staticmethod
+    def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Distance orthodromique (NM) entre deux points, sur des flottants simples (module math uniquement)"""
+        lat1, lon1 = lat1 * DEG_TO_RAD, lon1 * DEG_TO_RAD
+        lat2, lon2 = lat2 * DEG_TO_RAD, lon2 * DEG_TO_RAD
+        
+        a = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+        return 6371.0 * 2 * math.asin(math.sqrt(a)) / 1.852
+    
+    @staticmethod
+    def haversine_distances_nm(latitudes, longitudes) -> np.ndarray:
+        """Distances orthodromiques (NM) entre points consécutifs, calculées en une passe vectorisée"""
+        lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+        
+        a = np.sin(np.diff(lat) / 2)**2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2)**2
+        distance_km = 6371.0 * 2 * np.arcsin(np.sqrt(a))
+        return UnitConverter.km_to_nautical_miles(distance_km)
+    
+    @staticmethod
+    def geodesic_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Distance géodésique WGS84 (NM) entre deux points ; haversine si pyproj est absent"""
+        if _GEOD is None:
+            return UnitConverter.haversine_nm(lat1, lon1, lat2, lon2)
+        _, _, distance_m = _GEOD.inv(lon1, lat1, lon2, lat2)
+        return distance_m / 1852.0
+    
+    @staticmethod
+    def geodesic_distances_nm(latitudes, longitudes) -> np.ndarray:
+        """Distances géodésiques WGS84 (NM) entre points consécutifs ; haversine si pyproj est absent"""
+        if _GEOD is None:
+            return UnitConverter.haversine_distances_nm(latitudes, longitudes)
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        
+        _, _, distance_m = _GEOD.inv(lon[:-1], lat[:-1], lon[1:], lat[1:])
+        return np.asarray(distance_m) / 1852.0
+    
+    @staticmethod
+    def equirectangular_distances_nm(latitudes, longitudes) -> np.ndarray:
+        """
+        Distances approchées (NM) entre points consécutifs, projection équirectangulaire
+        
+        Un seul cosinus par segment ; écart < 0,1 % avec haversine pour des branches VFR
+        (< 100 NM). Réservé à l'affichage, pas à la géométrie de montée/descente.
+        """
+        lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+        
+        x = np.diff(lon) * np.cos((lat[:-1] + lat[1:]) / 2)
+        distance_km = 6371.0 * np.hypot(x, np.diff(lat))
+        return UnitConverter.km_to_nautical_miles(distance_km)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
     def format_altitude(altitude_meters: float, unit: str = 'ft') -> str:
-        """Formate une altitude avec l'unité appropriée"""
+        """Formate une altitude avec l'unité appropriée (mis en cache : quelques niveaux reviennent sans cesse)"""
         if unit == 'ft':
             alt_ft = UnitConverter.meters_to_feet(altitude_meters)
             return f"{alt_ft:.0f} ft"
@@ -54,10 +136,89 @@ class UnitConverter:
 class ElevationAPI:
     """Classe pour récupérer les altitudes du terrain via API"""
     
-    def __init__(self):
+    def __init__(self, disk_cache_path: Optional[str] = ELEVATION_CACHE_PATH):
+        """
+        Args:
+            disk_cache_path: Fichier shelve du cache disque des altitudes d'aéroports
+                (None pour désactiver le cache disque)
+        """
         self.cache: Dict[Tuple[float, float], float] = {}
         self.rate_limit_delay = 0.1  # 100ms entre les requêtes
         self.last_request_time = 0
+        self.disk_cache_path = disk_cache_path
+        # Altitudes résolues, clé = coordonnées arrondies à ELEVATION_CACHE_DECIMALS
+        self.airport_cache: Dict[Tuple[float, float], float] = {}
+        # Points que la dernière requête groupée Open Elevation n'a pas résolus
+        self.open_elevation_failures: set = set()
+    
+    @staticmethod
+    def _disk_cache_key(lat_q: float, lon_q: float) -> str:
+        """Clé du cache disque pour des coordonnées arrondies"""
+        return f"{lat_q:.{ELEVATION_CACHE_DECIMALS}f},{lon_q:.{ELEVATION_CACHE_DECIMALS}f}"
+    
+    def _read_disk_cache(self, locations: List[Tuple[float, float]]) -> Dict[Tuple[float, float], float]:
+        """Altitudes déjà présentes dans le cache disque (toute erreur d'accès est ignorée)"""
+        if self.disk_cache_path is None or not locations:
+            return {}
+        try:
+            with shelve.open(self.disk_cache_path, flag='r') as disk_cache:
+                return {
+                    location: disk_cache[key]
+                    for location, key in ((location, self._disk_cache_key(*location)) for location in locations)
+                    if key in disk_cache
+                }
+        except Exception:
+            return {}
+    
+    def _write_disk_cache(self, elevations: Dict[Tuple[float, float], float]):
+        """Enregistre des altitudes dans le cache disque, s'il est activé"""
+        if self.disk_cache_path is None or not elevations:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.disk_cache_path) or '.', exist_ok=True)
+            with shelve.open(self.disk_cache_path) as disk_cache:
+                for location, elevation in elevations.items():
+                    disk_cache[self._disk_cache_key(*location)] = elevation
+        except Exception as e:
+            print(f"  (cache disque indisponible: {e})")
+    
+    def clear_cache(self):
+        """Vide les caches mémoire et, s'il est activé, le cache disque"""
+        self.cache.clear()
+        self.airport_cache.clear()
+        if self.disk_cache_path is None:
+            return
+        try:
+            with shelve.open(self.disk_cache_path) as disk_cache:
+                disk_cache.clear()
+        except Exception as e:
+            print(f"  (cache disque indisponible: {e})")
+    
+    def prefetch_elevations(self, locations: List[Tuple[float, float]]) -> Dict[Tuple[float, float], float]:
+        """
+        Remplit airport_cache pour une liste de (latitude, longitude)
+        
+        Les points absents du cache mémoire sont d'abord cherchés sur disque,
+        puis les restants sont demandés en une seule requête groupée ; ceux
+        qu'elle ne résout pas sont notés dans open_elevation_failures.
+        
+        Returns:
+            Les altitudes obtenues par cette requête réseau
+        """
+        quantized = ((round(lat, ELEVATION_CACHE_DECIMALS), round(lon, ELEVATION_CACHE_DECIMALS)) for lat, lon in locations)
+        missing = [location for location in dict.fromkeys(quantized) if location not in self.airport_cache]
+        from_disk = self._read_disk_cache(missing)
+        self.airport_cache.update(from_disk)
+        
+        missing = [location for location in missing if location not in from_disk]
+        if missing:
+            fetched = self.get_elevations_open_elevation(missing)
+            self.airport_cache.update(fetched)
+            self._write_disk_cache(fetched)
+            self.open_elevation_failures.difference_update(fetched)
+            self.open_elevation_failures.update(location for location in missing if location not in fetched)
+            return fetched
+        return {}
     
     def _respect_rate_limit(self):
         """Respecte la limite de taux de requêtes"""
@@ -90,7 +251,7 @@ class ElevationAPI:
                 'locations': f"{latitude},{longitude}"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -105,6 +266,52 @@ class ElevationAPI:
         
         return None
     
+    def get_elevations_open_elevation(self, locations: List[Tuple[float, float]]) -> Dict[Tuple[float, float], float]:
+        """
+        Récupère plusieurs altitudes en une seule requête Open Elevation
+        
+        Args:
+            locations: Liste de (latitude, longitude) en degrés décimaux
+            
+        Returns:
+            Dictionnaire {(latitude, longitude): altitude_en_mètres} pour les points obtenus
+        """
+        elevations = {}
+        missing = []
+        for latitude, longitude in locations:
+            cache_key = (round(latitude, 6), round(longitude, 6))
+            if cache_key in self.cache:
+                elevations[(latitude, longitude)] = self.cache[cache_key]
+            else:
+                missing.append((latitude, longitude))
+        
+        if not missing:
+            return elevations
+        
+        self._respect_rate_limit()
+        
+        try:
+            url = "https://api.open-elevation.com/api/v1/lookup"
+            params = {
+                'locations': "|".join(f"{latitude},{longitude}" for latitude, longitude in missing)
+            }
+            
+            response = _http_session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json()
+            # Les résultats sont renvoyés dans l'ordre des points demandés
+            for (latitude, longitude), result in zip(missing, data.get('results', [])):
+                elevation = result.get('elevation')
+                if elevation is not None:
+                    self.cache[(round(latitude, 6), round(longitude, 6))] = float(elevation)
+                    elevations[(latitude, longitude)] = float(elevation)
+            
+        except Exception as e:
+            print(f"Erreur lors de la récupération groupée des altitudes via Open Elevation: {e}")
+        
+        return elevations
+    
     def get_elevation_usgs(self, latitude: float, longitude: float) -> Optional[float]:
         """
         Récupère l'altitude du terrain via l'API USGS (pour les USA uniquement)
@@ -132,7 +339,7 @@ class ElevationAPI:
                 'output': 'json'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -175,7 +382,7 @@ class ElevationAPI:
                 'key': api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = _http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -190,7 +397,8 @@ class ElevationAPI:
         
         return None
     
-    def get_elevation(self, latitude: float, longitude: float, api_key: Optional[str] = None) -> Optional[float]:
+    def get_elevation(self, latitude: float, longitude: float, api_key: Optional[str] = None,
+                      try_open_elevation: bool = True) -> Optional[float]:
         """
         Récupère l'altitude du terrain en essayant plusieurs APIs
         
@@ -198,6 +406,8 @@ class ElevationAPI:
             latitude: Latitude en degrés décimaux
             longitude: Longitude en degrés décimaux
             api_key: Clé API Google (optionnelle)
+            try_open_elevation: False pour passer directement à Google/USGS
+                (point déjà refusé par Open Elevation)
             
         Returns:
             Altitude du terrain en mètres, ou None en cas d'erreur
@@ -205,10 +415,11 @@ class ElevationAPI:
         print(f"Récupération de l'altitude pour {latitude:.6f}, {longitude:.6f}")
         
         # Essayer d'abord Open Elevation (gratuit)
-        elevation = self.get_elevation_open_elevation(latitude, longitude)
-        if elevation is not None:
-            print(f"  -> {elevation:.1f}m (Open Elevation)")
-            return elevation
+        if try_open_elevation:
+            elevation = self.get_elevation_open_elevation(latitude, longitude)
+            if elevation is not None:
+                print(f"  -> {elevation:.1f}m (Open Elevation)")
+                return elevation
         
         # Si on a une clé API Google, l'essayer
         if api_key:
@@ -239,10 +450,29 @@ class ElevationAPI:
             Dictionnaire {code_aéroport: altitude_en_mètres}
         """
         altitudes = {}
+        quantized = {
+            airport_code: (round(lat, ELEVATION_CACHE_DECIMALS), round(lon, ELEVATION_CACHE_DECIMALS))
+            for airport_code, (lat, lon) in airport_codes.items()
+        }
+        
+        # Une seule requête réseau pour tous les aéroports absents des caches
+        fetched = self.prefetch_elevations(list(quantized.values()))
         
-        for airport_code, (lat, lon) in airport_codes.items():
+        for airport_code, location in quantized.items():
             print(f"\nRécupération de l'altitude pour {airport_code}")
-            elevation = self.get_elevation(lat, lon, api_key)
+            elevation = self.airport_cache.get(location)
+            if elevation is not None:
+                print(f"  -> {elevation:.1f}m ({'Open Elevation' if location in fetched else 'cache'})")
+            else:
+                # Open Elevation vient d'échouer pour ce point : seulement les autres APIs
+                elevation = self.get_elevation(
+                    *location, api_key,
+                    try_open_elevation=location not in self.open_elevation_failures
+                )
+                if elevation is not None:
+                    self.airport_cache[location] = elevation
+                    self._write_disk_cache({location: elevation})
+            
             if elevation is not None:
                 altitudes[airport_code] = elevation
             else:
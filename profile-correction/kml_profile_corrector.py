@@ -13,13 +13,62 @@ Logic:
 
 import xml.etree.ElementTree as ET
 import re
-import math
+import os
+import sys
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import List, Tuple, Optional, Dict
-from dataclasses import dataclass
-from aviation_utils import UnitConverter, ElevationAPI, extract_airport_coordinates_from_kml
+from dataclasses import dataclass, field
+from functools import lru_cache
+from aviation_utils import UnitConverter, ElevationAPI, extract_airport_coordinates_from_kml, FEET_PER_METER, ELEVATION_CACHE_PATH
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-@dataclass
+# Qualified KML tag names, as reported by the XML parser
+KML_NAMESPACE = '{http://www.opengis.net/kml/2.2}'
+KML_LINESTRING = KML_NAMESPACE + 'LineString'
+KML_COORDINATES = KML_NAMESPACE + 'coordinates'
+KML_PLACEMARK = KML_NAMESPACE + 'Placemark'
+KML_NAME = KML_NAMESPACE + 'name'
+
+# Departure/arrival altitudes: field elevation (500 ft when unknown) + 1000 ft
+DEFAULT_FIELD_ELEVATION_M = UnitConverter.feet_to_meters(500)
+FIELD_ALTITUDE_OFFSET_M = UnitConverter.feet_to_meters(1000)
+
+# Name of the synthetic point where the final descent starts
+DESCENT_START_NAME = "Descent_Start"
+
+# Characters encoded per write when saving the corrected KML
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Synthetic climb/descent points: name prefix -> (visibility, description, style); hidden by default
+SYNTHETIC_POINT_KINDS = {
+    "Climb_": ("0", "Climb point", "#msn_grn-pushpin"),
+    "Descent_": ("0", "Descent point", "#msn_red-pushpin"),
+}
+
+# Patterns used to rewrite the original KML text, compiled once
+COORDINATES_RE = re.compile(r'<coordinates>[^<]*</coordinates>')
+POINTS_FOLDER_RE = re.compile(r'<Folder>\s*<name>Points</name>.*?</Folder>', re.DOTALL)
+# A placemark body never spans another <Placemark> or </Placemark> tag: each match attempt
+# stops at the next placemark boundary, so an unclosed placemark cannot trigger a rescan to EOF
+PLACEMARK_RE = re.compile(r'<Placemark>[^<]*(?:<(?!/?Placemark>)[^<]*)*</Placemark>')
+NAME_RE = re.compile(r'<name>(.*?)</name>', re.DOTALL)
+DOCUMENT_END_RE = re.compile(r'(</Document>)')
+# Coordinate separators: KML exports mix commas and whitespace between values
+COORD_SPLIT_RE = re.compile(r'[\s,]+')
+
+
+# Points and branches are created by the dozen per route: slotted records where supported (Python 3.10+)
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class KMLPoint:
     """Represents a navigation point with coordinates and metadata"""
     name: str
@@ -32,7 +81,7 @@ class KMLPoint:
         return f"{self.name} ({self.longitude:.6f}, {self.latitude:.6f}) @ {UnitConverter.format_altitude(self.altitude)}"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Branch:
     """Represents a branch between two consecutive KML points"""
     start_point: KMLPoint
@@ -44,27 +93,18 @@ class Branch:
     end_of_action_point: Optional[Tuple[float, float, float]] = None  # (lon, lat, alt) if climb/descent needed
     is_unreachable: bool = False  # Flag for unreachable altitude
     unreachable_reason: str = ""  # Reason why unreachable
+    _start_altitude_ft: Optional[float] = field(default=None, repr=False, compare=False)  # Display only, set during analysis
     
     def __str__(self):
-        action_desc = ""
-        if self.action == "CLIMB":
-            # Calculate starting altitude for this branch
-            if hasattr(self, '_start_altitude_ft'):
-                start_alt_ft = self._start_altitude_ft
-            else:
-                start_alt_ft = UnitConverter.meters_to_feet(self.target_altitude) - self.altitude_change_ft
-            target_alt_ft = UnitConverter.meters_to_feet(self.target_altitude)
-            action_desc = f"CLIMB from {start_alt_ft:.0f} ft to {target_alt_ft:.0f} ft ({self.altitude_change_ft:+.0f} ft)"
-        elif self.action == "DESCENT":
-            # Calculate starting altitude for this branch
-            if hasattr(self, '_start_altitude_ft'):
-                start_alt_ft = self._start_altitude_ft
-            else:
-                start_alt_ft = UnitConverter.meters_to_feet(self.target_altitude) - self.altitude_change_ft
-            target_alt_ft = UnitConverter.meters_to_feet(self.target_altitude)
-            action_desc = f"DESCENT from {start_alt_ft:.0f} ft to {target_alt_ft:.0f} ft ({self.altitude_change_ft:+.0f} ft)"
+        target_alt_ft = self.target_altitude * FEET_PER_METER
+        if self.action in ("CLIMB", "DESCENT"):
+            # Starting altitude for this branch, derived from the change when not set by the analysis
+            start_alt_ft = self._start_altitude_ft
+            if start_alt_ft is None:
+                start_alt_ft = target_alt_ft - self.altitude_change_ft
+            action_desc = f"{self.action} from {start_alt_ft:.0f} ft to {target_alt_ft:.0f} ft ({self.altitude_change_ft:+.0f} ft)"
         else:
-            action_desc = f"LEVEL at {UnitConverter.meters_to_feet(self.target_altitude):.0f} ft"
+            action_desc = f"LEVEL at {target_alt_ft:.0f} ft"
         
         # Add warning if unreachable
         if self.is_unreachable:
@@ -73,11 +113,89 @@ class Branch:
         return f"{self.start_point.name} -> {self.end_point.name}: {action_desc} ({self.distance_nm:.1f} NM)"
 
 
+def _last_word(name: str) -> Optional[str]:
+    """Last word of a name containing a space (e.g. the ICAO code of "Chateauneuf LFFU"), None otherwise"""
+    _, sep, last_word = name.rpartition(' ')
+    if not sep:
+        return None
+    # rpartition avoids building the word list; unusual names (tabs, punctuation) still go through split()
+    return last_word if last_word.isalnum() else name.split()[-1]
+
+
+def _synthetic_point_kind(name: str) -> Optional[Tuple[str, str, str]]:
+    """(visibility, description, style) of a synthetic climb/descent point, None for a waypoint
+    
+    A single dict probe on the name prefix up to the first underscore replaces
+    startswith checks against each prefix.
+    """
+    return SYNTHETIC_POINT_KINDS.get(name[:name.find('_') + 1])
+
+
+# Point placemark of a corrected profile point. The doubled-brace fields survive format_map
+# as {name}/{description}/{coordinates} markers, where the per-point text is spliced in
+_POINT_PLACEMARK_TEMPLATE = (
+    "{indent}<Placemark>\n"
+    "{indent}    <name>{{name}}</name>\n"
+    "{indent}    <visibility>{visibility}</visibility>\n"
+    "{indent}    <description>{{description}}</description>\n"
+    "{indent}    <styleUrl>{style}</styleUrl>\n"
+    "{indent}    <Point>\n"
+    "{indent}        <extrude>1</extrude>\n"
+    "{indent}        <altitudeMode>absolute</altitudeMode>\n"
+    "{indent}        <gx:drawOrder>1</gx:drawOrder>\n"
+    "{indent}        <coordinates>{{coordinates}}</coordinates>\n"
+    "{indent}    </Point>\n"
+    "{indent}</Placemark>"
+)
+
+
+@lru_cache(maxsize=16)
+def _point_placemark_parts(indent: str, visibility: str, style: str) -> Tuple[str, str, str, str]:
+    """Fixed text of a Point placemark, split around its name, description and coordinates"""
+    text = _POINT_PLACEMARK_TEMPLATE.format_map({'indent': indent, 'visibility': visibility, 'style': style})
+    head, _, rest = text.partition('{name}')
+    before_description, _, rest = rest.partition('{description}')
+    before_coordinates, _, tail = rest.partition('{coordinates}')
+    return head, before_description, before_coordinates, tail
+
+
+def _compute_branch_plan(altitudes_m: np.ndarray, climb_rate_fpm: float, descent_rate_fpm: float,
+                         ground_speed_kts: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-leg start altitude (ft), altitude change to the next point (ft) and ground distance it needs (NM)"""
+    diffs_ft = np.diff(altitudes_m) * FEET_PER_METER
+    rates_fpm = np.where(diffs_ft > 0, climb_rate_fpm, descent_rate_fpm)
+    return altitudes_m * FEET_PER_METER, diffs_ft, np.abs(diffs_ft) / rates_fpm * (ground_speed_kts / 60)
+
+
+if njit is not None:
+    # No fastmath: results must match the NumPy path bit for bit
+    @njit("UniTuple(f8[:], 3)(f8[:], f8, f8, f8)", cache=True)
+    def _compute_branch_plan_numba(altitudes_m, climb_rate_fpm, descent_rate_fpm, ground_speed_kts):
+        """Compiled branch plan kernel, same outputs as _compute_branch_plan"""
+        n = altitudes_m.shape[0]
+        start_altitudes_ft = np.empty(n)
+        diffs_ft = np.empty(n - 1)
+        distances_needed_nm = np.empty(n - 1)
+        nm_per_minute = ground_speed_kts / 60
+        
+        for i in range(n):
+            start_altitudes_ft[i] = altitudes_m[i] * FEET_PER_METER
+        for i in range(n - 1):
+            diff_ft = (altitudes_m[i + 1] - altitudes_m[i]) * FEET_PER_METER
+            rate_fpm = climb_rate_fpm if diff_ft > 0 else descent_rate_fpm
+            diffs_ft[i] = diff_ft
+            distances_needed_nm[i] = abs(diff_ft) / rate_fpm * nm_per_minute
+        return start_altitudes_ft, diffs_ft, distances_needed_nm
+else:
+    _compute_branch_plan_numba = None
+
+
 class KMLProfileCorrector:
     """KML profile corrector that works on any KML file"""
     
     def __init__(self, climb_rate_fpm: float = 500, descent_rate_fpm: float = 500, 
-                 ground_speed_kts: float = 100, api_key: Optional[str] = None):
+                 ground_speed_kts: float = 100, api_key: Optional[str] = None,
+                 elevation_cache_path: Optional[str] = ELEVATION_CACHE_PATH):
         """
         Initialize the profile corrector
         
@@ -86,28 +204,22 @@ class KMLProfileCorrector:
             descent_rate_fpm: Descent rate in feet per minute  
             ground_speed_kts: Ground speed in knots for time calculations
             api_key: Optional API key for elevation services
+            elevation_cache_path: Disk cache for airport elevations (None disables it)
         """
         self.climb_rate_fpm = climb_rate_fpm
         self.descent_rate_fpm = descent_rate_fpm
         self.ground_speed_kts = ground_speed_kts
-        self.elevation_api = ElevationAPI()
+        self.elevation_api = ElevationAPI(disk_cache_path=elevation_cache_path)
         self.api_key = api_key
         
     def calculate_distance_nm(self, p1: KMLPoint, p2: KMLPoint) -> float:
-        """Calculate great circle distance between two points in nautical miles"""
-        lat1, lon1 = math.radians(p1.latitude), math.radians(p1.longitude)
-        lat2, lon2 = math.radians(p2.latitude), math.radians(p2.longitude)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth radius in km, then convert to NM
-        R_km = 6371.0
-        distance_km = R_km * c
-        return UnitConverter.km_to_nautical_miles(distance_km)
+        """Calculate the distance between two points in nautical miles (WGS84 geodesic when pyproj is installed)"""
+        return UnitConverter.geodesic_nm(p1.latitude, p1.longitude, p2.latitude, p2.longitude)
+    
+    def _altitude_change_distance_nm(self, altitude_diff_ft: float) -> float:
+        """Ground distance (NM) flown during a climb (positive difference) or descent at the configured rates"""
+        rate_fpm = self.climb_rate_fpm if altitude_diff_ft > 0 else self.descent_rate_fpm
+        return abs(altitude_diff_ft) / rate_fpm * (self.ground_speed_kts / 60)
     
     def interpolate_point(self, p1: KMLPoint, p2: KMLPoint, fraction: float) -> Tuple[float, float]:
         """Interpolate a geographic position between two points"""
@@ -117,58 +229,50 @@ class KMLProfileCorrector:
     
     def parse_kml(self, kml_file: str) -> Tuple[List[KMLPoint], str]:
         """Parse KML file and extract navigation points"""
-        # Read original file content first
+        # Read original file content once: it feeds both the parser and the corrected output
         with open(kml_file, 'r', encoding='utf-8') as f:
             original_content = f.read()
         
         try:
-            tree = ET.parse(kml_file)
-            root = tree.getroot()
+            navigation_coords, placemark_names = self._scan_kml(original_content)
         except ET.ParseError as e:
             print(f"Warning: XML parsing error: {e}")
             print("Attempting to parse with namespace handling...")
             # Try to parse with explicit namespace registration
             try:
                 ET.register_namespace('gx', 'http://www.google.com/kml/ext/2.2')
-                tree = ET.parse(kml_file)
-                root = tree.getroot()
+                navigation_coords, placemark_names = self._scan_kml(original_content)
             except ET.ParseError as e2:
                 print(f"Failed to parse KML file: {e2}")
                 return [], original_content
         
-        namespaces = {
-            'kml': 'http://www.opengis.net/kml/2.2',
-            'gx': 'http://www.google.com/kml/ext/2.2'
-        }
         points = []
         
-        # Extract main navigation line coordinates
-        navigation_coords = None
-        for linestring in root.findall('.//kml:LineString', namespaces):
-            coords_elem = linestring.find('kml:coordinates', namespaces)
-            if coords_elem is not None:
-                navigation_coords = coords_elem.text.strip()
-                break
-        
         if navigation_coords:
-            # Parse navigation line coordinates  
-            coords_list = navigation_coords.split(',')
-            for i in range(0, len(coords_list), 3):
-                if i + 2 < len(coords_list):
+            # Parse navigation line coordinates in one pass (lon,lat,alt triplets,
+            # separated by commas and/or whitespace); an incomplete trailing triplet is dropped
+            tokens = navigation_coords.replace(',', ' ')
+            try:
+                with warnings.catch_warnings():
+                    # Malformed value: ValueError with NumPy 2, DeprecationWarning before
+                    warnings.simplefilter('error', DeprecationWarning)
+                    values = np.fromstring(tokens, sep=' ')
+            except (ValueError, DeprecationWarning):
+                values = None
+            
+            if values is not None:
+                triplets = values[:values.size - values.size % 3].reshape(-1, 3)
+                points = [KMLPoint(f"Point_{i}", lon, lat, alt)
+                          for i, (lon, lat, alt) in enumerate(triplets.tolist())]
+            else:
+                # Malformed values: parse triplet by triplet, skipping the invalid ones
+                token_list = COORD_SPLIT_RE.split(navigation_coords.strip(', \t\r\n'))
+                for i in range(0, len(token_list) - 2, 3):
                     try:
-                        lon = float(coords_list[i])
-                        lat = float(coords_list[i + 1])
-                        alt = float(coords_list[i + 2])
-                        points.append(KMLPoint(f"Point_{i//3}", lon, lat, alt))
+                        lon, lat, alt = float(token_list[i]), float(token_list[i + 1]), float(token_list[i + 2])
                     except ValueError:
                         continue
-        
-        # Get point names from Placemarks
-        placemark_names = []
-        for placemark in root.findall('.//kml:Placemark', namespaces):
-            name_elem = placemark.find('kml:name', namespaces)
-            if name_elem is not None and name_elem.text != "Navigation":
-                placemark_names.append(name_elem.text)
+                    points.append(KMLPoint(f"Point_{i//3}", lon, lat, alt))
         
         # Associate names with points
         for i, point in enumerate(points):
@@ -177,6 +281,35 @@ class KMLProfileCorrector:
         
         return points, original_content
     
+    def _scan_kml(self, content: str, chunk_size: int = 1 << 16) -> Tuple[Optional[str], List[str]]:
+        """
+        Single streaming pass over the KML document
+        
+        Returns:
+            (coordinates text of the first LineString, names of the Placemarks other than "Navigation")
+        """
+        navigation_coords = None
+        placemark_names = []
+        
+        parser = ET.XMLPullParser(events=('end',))
+        for offset in range(0, len(content), chunk_size):
+            parser.feed(content[offset:offset + chunk_size])
+            for _, elem in parser.read_events():
+                if elem.tag == KML_LINESTRING and navigation_coords is None:
+                    # Extract main navigation line coordinates
+                    coords_elem = elem.find(KML_COORDINATES)
+                    if coords_elem is not None:
+                        navigation_coords = coords_elem.text.strip()
+                elif elem.tag == KML_PLACEMARK:
+                    # Get point names from Placemarks, then free the subtree
+                    name_elem = elem.find(KML_NAME)
+                    if name_elem is not None and name_elem.text != "Navigation":
+                        placemark_names.append(name_elem.text)
+                    elem.clear()
+        parser.close()
+        
+        return navigation_coords, placemark_names
+    
     def get_ground_elevations(self, points: List[KMLPoint], original_content: str) -> Dict[str, float]:
         """Get ground elevations for departure/destination airports (first and last points only)"""
         if len(points) < 2:
@@ -209,206 +342,51 @@ class KMLProfileCorrector:
         if len(points) < 2:
             return []
         
-        branches = []
-        
         # Set corrected altitudes for departure and arrival points
         # Departure point (first point): field elevation + 1000 ft
-        departure_elevation = ground_elevations.get(points[0].name, UnitConverter.feet_to_meters(500))  # Default 500m if unknown
-        departure_altitude = departure_elevation + UnitConverter.feet_to_meters(1000)
+        departure_elevation = ground_elevations.get(points[0].name, DEFAULT_FIELD_ELEVATION_M)  # Default 500 ft if unknown
+        departure_altitude = departure_elevation + FIELD_ALTITUDE_OFFSET_M
         
         # Arrival point (last point): field elevation + 1000 ft  
-        arrival_elevation = ground_elevations.get(points[-1].name, UnitConverter.feet_to_meters(500))  # Default 500m if unknown
-        arrival_altitude = arrival_elevation + UnitConverter.feet_to_meters(1000)
+        arrival_elevation = ground_elevations.get(points[-1].name, DEFAULT_FIELD_ELEVATION_M)  # Default 500 ft if unknown
+        arrival_altitude = arrival_elevation + FIELD_ALTITUDE_OFFSET_M
         
-        # Track current altitude as we progress through the flight
-        current_altitude = departure_altitude
+        # Leg distances for all consecutive point pairs, computed once
+        leg_distances_nm = UnitConverter.geodesic_distances_nm(
+            [p.latitude for p in points], [p.longitude for p in points]).tolist()
         
-        # Analyze each branch
-        for i in range(len(points) - 1):
-            start_point = points[i]
-            end_point = points[i + 1]
-            
-            # Calculate distance first (needed for calculations below)
-            distance_nm = self.calculate_distance_nm(start_point, end_point)
-            
-            # Special handling for first branch - may need initial climb from departure
-            if i == 0:  # First branch from departure
-                target_waypoint_altitude = end_point.altitude
-                altitude_diff_ft = UnitConverter.meters_to_feet(target_waypoint_altitude - current_altitude)
-                
-                if abs(altitude_diff_ft) > 50:  # Significant initial climb/descent needed
-                    change_action = "CLIMB" if altitude_diff_ft > 0 else "DESCENT"
-                    
-                    # Calculate distance needed for initial climb/descent
-                    rate_fpm = self.climb_rate_fpm if change_action == "CLIMB" else self.descent_rate_fpm
-                    time_needed_min = abs(altitude_diff_ft) / rate_fpm
-                    distance_needed_nm = (self.ground_speed_kts / 60) * time_needed_min
-                    
-                    if distance_needed_nm < distance_nm:
-                        # Split first branch into climb + level segments
-                        climb_end_fraction = distance_needed_nm / distance_nm
-                        climb_end_lon, climb_end_lat = self.interpolate_point(start_point, end_point, climb_end_fraction)
-                        level_distance_nm = distance_nm - distance_needed_nm
-                        
-                        # Create climb segment (departure to climb end)
-                        climb_branch = Branch(
-                            start_point=start_point,
-                            end_point=KMLPoint(f"Climb_{end_point.name.replace(' ', '_')}_{int(UnitConverter.meters_to_feet(target_waypoint_altitude))}", 
-                                             climb_end_lon, climb_end_lat, target_waypoint_altitude),
-                            target_altitude=target_waypoint_altitude,  # Target waypoint altitude
-                            distance_nm=distance_needed_nm,
-                            action=change_action,
-                            altitude_change_ft=altitude_diff_ft
-                        )
-                        climb_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branches.append(climb_branch)
-                        
-                        # Create level segment (climb end to waypoint)  
-                        if level_distance_nm > 0:
-                            level_branch = Branch(
-                                start_point=KMLPoint(f"Climb_{end_point.name.replace(' ', '_')}_{int(UnitConverter.meters_to_feet(target_waypoint_altitude))}", 
-                                                   climb_end_lon, climb_end_lat, target_waypoint_altitude),
-                                end_point=end_point,
-                                target_altitude=target_waypoint_altitude,  # Maintain target altitude
-                                distance_nm=level_distance_nm,
-                                action="LEVEL",
-                                altitude_change_ft=0
-                            )
-                            level_branch._start_altitude_ft = UnitConverter.meters_to_feet(target_waypoint_altitude)
-                            branches.append(level_branch)
-                        
-                        # Update current altitude and continue
-                        current_altitude = target_waypoint_altitude
-                        continue
-                    else:
-                        # Not enough distance - climb/descend throughout entire segment
-                        branch = Branch(
-                            start_point=start_point,
-                            end_point=end_point,
-                            target_altitude=target_waypoint_altitude,
-                            distance_nm=distance_nm,
-                            action=change_action,
-                            altitude_change_ft=altitude_diff_ft
-                        )
-                        branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branch.is_unreachable = True
-                        branch.unreachable_reason = f"Need {distance_needed_nm:.1f} NM but only {distance_nm:.1f} NM available"
-                        branches.append(branch)
-                        current_altitude = target_waypoint_altitude
-                        continue
-                else:
-                    # No significant altitude change needed from departure - create simple level branch
-                    target_altitude = current_altitude
-                    action = "LEVEL"
-                    altitude_change_ft = 0
-                    
-                    # Create branch
-                    branch = Branch(
-                        start_point=start_point,
-                        end_point=end_point,
-                        target_altitude=target_altitude,
-                        distance_nm=distance_nm,
-                        action=action,
-                        altitude_change_ft=altitude_change_ft
-                    )
-                    
-                    # Store starting altitude for display purposes
-                    branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                    branch.end_of_action_point = None
-                    branches.append(branch)
-                    
-                    # Update current altitude to waypoint altitude
-                    current_altitude = end_point.altitude
-                    continue
-            
-            # Special handling for final branch - may need to split into level + descent
-            if i == len(points) - 2:  # Final branch to destination
-                # Check if we need final descent
-                final_altitude_diff_ft = UnitConverter.meters_to_feet(arrival_altitude - current_altitude)
-                
-                if abs(final_altitude_diff_ft) > 50:  # Significant final descent needed
-                    change_action = "DESCENT" if final_altitude_diff_ft < 0 else "CLIMB"
-                    
-                    # Calculate distance needed for final descent/climb
-                    rate_fpm = self.descent_rate_fpm if change_action == "DESCENT" else self.climb_rate_fpm
-                    time_needed_min = abs(final_altitude_diff_ft) / rate_fpm
-                    distance_needed_nm = (self.ground_speed_kts / 60) * time_needed_min
-                    
-                    if distance_needed_nm < distance_nm:
-                        # Split final branch into level + descent segments
-                        level_distance_nm = distance_nm - distance_needed_nm
-                        descent_start_fraction = level_distance_nm / distance_nm
-                        descent_start_lon, descent_start_lat = self.interpolate_point(start_point, end_point, descent_start_fraction)
-                        
-                        # Create level segment (waypoint to descent start)
-                        level_branch = Branch(
-                            start_point=start_point,
-                            end_point=KMLPoint("Descent_Start", descent_start_lon, descent_start_lat, current_altitude),
-                            target_altitude=current_altitude,  # Maintain current altitude
-                            distance_nm=level_distance_nm,
-                            action="LEVEL",
-                            altitude_change_ft=0
-                        )
-                        level_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branches.append(level_branch)
-                        
-                        # Create descent segment (descent start to destination)
-                        descent_branch = Branch(
-                            start_point=KMLPoint("Descent_Start", descent_start_lon, descent_start_lat, current_altitude),
-                            end_point=end_point,
-                            target_altitude=arrival_altitude,  # Arrival altitude
-                            distance_nm=distance_needed_nm,
-                            action=change_action,
-                            altitude_change_ft=final_altitude_diff_ft
-                        )
-                        descent_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        # Add descent point at the start of the final descent 
-                        # The descent point should be at the starting altitude (2900 ft), not midway
-                        descent_branch.end_of_action_point = (descent_start_lon, descent_start_lat, current_altitude)
-                        branches.append(descent_branch)
-                        
-                        # Update current altitude and skip regular branch processing
-                        current_altitude = arrival_altitude
-                        continue  # Skip the rest of the loop iteration
-                    else:
-                        # Not enough distance - descend/climb from start of segment
-                        branch = Branch(
-                            start_point=start_point,
-                            end_point=end_point,
-                            target_altitude=arrival_altitude,
-                            distance_nm=distance_nm,
-                            action=change_action,
-                            altitude_change_ft=final_altitude_diff_ft
-                        )
-                        branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branch.is_unreachable = True
-                        branch.unreachable_reason = f"Need {distance_needed_nm:.1f} NM but only {distance_nm:.1f} NM available"
-                        branches.append(branch)
-                        current_altitude = arrival_altitude
-                        continue  # Skip the rest of the loop iteration
-                else:
-                    # No significant altitude change needed - create simple level branch
-                    target_altitude = current_altitude
-                    action = "LEVEL"
-                    altitude_change_ft = 0
-            else:
-                # Regular branch - maintain current altitude until reaching the END waypoint
-                target_altitude = current_altitude  # Maintain current altitude for this branch
-                action = "LEVEL"
-                altitude_change_ft = 0
+        last_branch = len(points) - 2
+        
+        # Intermediate legs are entered at their start waypoint altitude, so their altitude
+        # changes and the ground distances these need can be computed for all legs at once
+        altitudes_m = np.array([p.altitude for p in points], dtype=np.float64)
+        compute_plan = _compute_branch_plan_numba if _compute_branch_plan_numba is not None else _compute_branch_plan
+        start_altitudes_ft, altitude_diffs_ft, distances_needed_nm = (
+            array.tolist() for array in compute_plan(
+                altitudes_m, float(self.climb_rate_fpm), float(self.descent_rate_fpm), float(self.ground_speed_kts)))
+        
+        # First branch from departure - may need initial climb
+        # (a single-leg route is handled here too: departure altitude takes precedence)
+        branches, current_altitude = self._emit_initial_climb(
+            points[0], points[1], leg_distances_nm[0], departure_altitude)
+        
+        # Intermediate branches: level flight to each waypoint, then any altitude change from it
+        for i in range(1, last_branch):
+            start_point, end_point = points[i], points[i + 1]
+            distance_nm = leg_distances_nm[i]
             
-            # Create branch
+            # Regular branch - maintain current altitude until reaching the END waypoint
             branch = Branch(
                 start_point=start_point,
                 end_point=end_point, 
-                target_altitude=target_altitude,
+                target_altitude=current_altitude,
                 distance_nm=distance_nm,
-                action=action,
-                altitude_change_ft=altitude_change_ft
+                action="LEVEL",
+                altitude_change_ft=0
             )
             
             # Store starting altitude for display purposes
-            branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
+            branch._start_altitude_ft = start_altitudes_ft[i]
             
             # No end of action points for level flight branches
             branch.end_of_action_point = None
@@ -417,33 +395,12 @@ class KMLProfileCorrector:
             
             # After reaching the end waypoint, check if altitude needs to change
             waypoint_altitude = end_point.altitude
-            final_approach_handled = False
-            
-            if i == len(points) - 2:  # Last waypoint - use arrival altitude instead
-                waypoint_altitude = arrival_altitude
-                final_approach_handled = True  # We'll handle this specially below
-                
-            altitude_diff_ft = UnitConverter.meters_to_feet(waypoint_altitude - current_altitude)
+            altitude_diff_ft = altitude_diffs_ft[i]
             
             # If altitude change needed FROM this waypoint, create additional altitude change segment
-            if abs(altitude_diff_ft) > 50 and not final_approach_handled:  # Skip if we'll handle as final approach
-                if altitude_diff_ft > 0:
-                    change_action = "CLIMB"
-                else:
-                    change_action = "DESCENT"
-                    
-                # Calculate distance needed for altitude change
-                rate_fpm = self.climb_rate_fpm if change_action == "CLIMB" else self.descent_rate_fpm
-                time_needed_min = abs(altitude_diff_ft) / rate_fpm
-                distance_needed_nm = (self.ground_speed_kts / 60) * time_needed_min
-                
-                # Calculate where altitude change ends (for intermediate waypoints)
-                # For now, assume we have enough distance in the next segment
-                next_distance = 0
-                if i < len(points) - 2:  # Not the last branch
-                    next_start = points[i + 1]
-                    next_end = points[i + 2] 
-                    next_distance = self.calculate_distance_nm(next_start, next_end)
+            if abs(altitude_diff_ft) > 50:
+                change_action = "CLIMB" if altitude_diff_ft > 0 else "DESCENT"
+                distance_needed_nm = distances_needed_nm[i]
                 
                 # Create altitude change "branch" starting from current waypoint
                 altitude_branch = Branch(
@@ -455,108 +412,195 @@ class KMLProfileCorrector:
                     altitude_change_ft=altitude_diff_ft
                 )
                 
-                altitude_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
+                altitude_branch._start_altitude_ft = start_altitudes_ft[i]
                 
-                # Calculate end point of altitude change if we have enough distance
+                # Altitude change happens within next segment if it is long enough
+                next_distance = leg_distances_nm[i + 1]
                 if next_distance >= distance_needed_nm:
-                    # Altitude change happens within next segment
-                    if i < len(points) - 2:
-                        next_start = points[i + 1]
-                        next_end = points[i + 2]
-                        fraction = distance_needed_nm / next_distance
-                        end_lon, end_lat = self.interpolate_point(next_start, next_end, fraction)
-                        altitude_branch.end_of_action_point = (end_lon, end_lat, waypoint_altitude)
+                    fraction = distance_needed_nm / next_distance
+                    end_lon, end_lat = self.interpolate_point(points[i + 1], points[i + 2], fraction)
+                    altitude_branch.end_of_action_point = (end_lon, end_lat, waypoint_altitude)
                 
                 branches.append(altitude_branch)
             
-            # Handle final approach separately (after BEVRO altitude change)
-            if i == len(points) - 2:  # Last waypoint
-                final_altitude_diff_ft = UnitConverter.meters_to_feet(arrival_altitude - current_altitude)
-                
-                if abs(final_altitude_diff_ft) > 50:  # Significant final descent needed
-                    change_action = "DESCENT" if final_altitude_diff_ft < 0 else "CLIMB"
-                    
-                    # Calculate distance needed for final descent
-                    rate_fpm = self.descent_rate_fpm if change_action == "DESCENT" else self.climb_rate_fpm
-                    time_needed_min = abs(final_altitude_diff_ft) / rate_fpm
-                    distance_needed_nm = (self.ground_speed_kts / 60) * time_needed_min
-                    
-                    # Calculate total distance from current waypoint to destination
-                    final_distance_nm = self.calculate_distance_nm(end_point, points[-1])
-                    
-                    if distance_needed_nm < final_distance_nm:
-                        # Split into level segment + descent segment
-                        level_distance_nm = final_distance_nm - distance_needed_nm
-                        descent_start_fraction = level_distance_nm / final_distance_nm
-                        descent_start_lon, descent_start_lat = self.interpolate_point(end_point, points[-1], descent_start_fraction)
-                        
-                        # Create level segment (waypoint to descent start)
-                        level_branch = Branch(
-                            start_point=end_point,
-                            end_point=KMLPoint("Descent_Start", descent_start_lon, descent_start_lat, current_altitude),
-                            target_altitude=current_altitude,  # Maintain current altitude
-                            distance_nm=level_distance_nm,
-                            action="LEVEL",
-                            altitude_change_ft=0
-                        )
-                        level_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branches.append(level_branch)
-                        
-                        # Create descent segment (descent start to destination)
-                        descent_branch = Branch(
-                            start_point=KMLPoint("Descent_Start", descent_start_lon, descent_start_lat, current_altitude),
-                            end_point=points[-1],
-                            target_altitude=arrival_altitude,  # Arrival altitude
-                            distance_nm=distance_needed_nm,
-                            action=change_action,
-                            altitude_change_ft=final_altitude_diff_ft
-                        )
-                        descent_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        branches.append(descent_branch)
-                    else:
-                        # Not enough distance - descend from start of segment
-                        descent_branch = Branch(
-                            start_point=end_point,
-                            end_point=points[-1],
-                            target_altitude=arrival_altitude,
-                            distance_nm=final_distance_nm,
-                            action=change_action,
-                            altitude_change_ft=final_altitude_diff_ft
-                        )
-                        descent_branch._start_altitude_ft = UnitConverter.meters_to_feet(current_altitude)
-                        descent_branch.is_unreachable = True
-                        descent_branch.unreachable_reason = f"Need {distance_needed_nm:.1f} NM but only {final_distance_nm:.1f} NM available"
-                        branches.append(descent_branch)
-            
             # Update current altitude to waypoint altitude
             current_altitude = waypoint_altitude
         
+        # Final branch to destination - may need to split into level + descent
+        if last_branch > 0:
+            branches.extend(self._emit_final_descent(
+                points[-2], points[-1], leg_distances_nm[-1], current_altitude, arrival_altitude))
+        
         return branches
     
-    def print_branch_analysis_table(self, branches: List[Branch]):
-        """Print a table showing branch analysis and actions"""
-        print(f"\n{'='*80}")
-        print("BRANCH ANALYSIS TABLE")
-        print(f"{'='*80}")
-        print(f"{'Branch':<20} {'Distance':<10} {'Action':<50}")
-        print("-" * 80)
+    def _emit_initial_climb(self, start_point: KMLPoint, end_point: KMLPoint, distance_nm: float,
+                            current_altitude: float) -> Tuple[List[Branch], float]:
+        """Branches for the first leg from departure, and the altitude reached at its end"""
+        target_waypoint_altitude = end_point.altitude
+        altitude_diff_ft = (target_waypoint_altitude - current_altitude) * FEET_PER_METER
         
-        unreachable_count = 0
-        for i, branch in enumerate(branches, 1):
-            branch_name = f"Branch {i}"
-            distance_str = f"{branch.distance_nm:.1f} NM"
-            
-            if branch.is_unreachable:
-                unreachable_count += 1
+        if abs(altitude_diff_ft) <= 50:
+            # No significant altitude change needed from departure - create simple level branch
+            branch = Branch(
+                start_point=start_point,
+                end_point=end_point,
+                target_altitude=current_altitude,
+                distance_nm=distance_nm,
+                action="LEVEL",
+                altitude_change_ft=0
+            )
             
-            print(f"{branch_name:<20} {distance_str:<10} {branch}")
+            # Store starting altitude for display purposes
+            branch._start_altitude_ft = current_altitude * FEET_PER_METER
+            branch.end_of_action_point = None
+            return [branch], end_point.altitude
+        
+        change_action = "CLIMB" if altitude_diff_ft > 0 else "DESCENT"
+        
+        # Calculate distance needed for initial climb/descent
+        distance_needed_nm = self._altitude_change_distance_nm(altitude_diff_ft)
         
-        print("-" * 80)
-        print(f"Total branches: {len(branches)}")
+        if distance_needed_nm >= distance_nm:
+            # Not enough distance - climb/descend throughout entire segment
+            branch = Branch(
+                start_point=start_point,
+                end_point=end_point,
+                target_altitude=target_waypoint_altitude,
+                distance_nm=distance_nm,
+                action=change_action,
+                altitude_change_ft=altitude_diff_ft
+            )
+            branch._start_altitude_ft = current_altitude * FEET_PER_METER
+            branch.is_unreachable = True
+            branch.unreachable_reason = f"Need {distance_needed_nm:.1f} NM but only {distance_nm:.1f} NM available"
+            return [branch], target_waypoint_altitude
+        
+        # Split first branch into climb + level segments
+        climb_end_fraction = distance_needed_nm / distance_nm
+        climb_end_lon, climb_end_lat = self.interpolate_point(start_point, end_point, climb_end_fraction)
+        level_distance_nm = distance_nm - distance_needed_nm
+        climb_end_name = f"Climb_{end_point.name.replace(' ', '_')}_{int(target_waypoint_altitude * FEET_PER_METER)}"
+        
+        # Create climb segment (departure to climb end)
+        climb_branch = Branch(
+            start_point=start_point,
+            end_point=KMLPoint(climb_end_name, climb_end_lon, climb_end_lat, target_waypoint_altitude),
+            target_altitude=target_waypoint_altitude,  # Target waypoint altitude
+            distance_nm=distance_needed_nm,
+            action=change_action,
+            altitude_change_ft=altitude_diff_ft
+        )
+        climb_branch._start_altitude_ft = current_altitude * FEET_PER_METER
+        branches = [climb_branch]
+        
+        # Create level segment (climb end to waypoint)  
+        if level_distance_nm > 0:
+            level_branch = Branch(
+                start_point=KMLPoint(climb_end_name, climb_end_lon, climb_end_lat, target_waypoint_altitude),
+                end_point=end_point,
+                target_altitude=target_waypoint_altitude,  # Maintain target altitude
+                distance_nm=level_distance_nm,
+                action="LEVEL",
+                altitude_change_ft=0
+            )
+            level_branch._start_altitude_ft = target_waypoint_altitude * FEET_PER_METER
+            branches.append(level_branch)
+        
+        return branches, target_waypoint_altitude
+    
+    def _emit_final_descent(self, start_point: KMLPoint, end_point: KMLPoint, distance_nm: float,
+                            current_altitude: float, arrival_altitude: float) -> List[Branch]:
+        """Branches for the last leg into the destination, ending at arrival altitude"""
+        # Check if we need final descent
+        final_altitude_diff_ft = (arrival_altitude - current_altitude) * FEET_PER_METER
+        
+        if abs(final_altitude_diff_ft) <= 50:
+            # No significant altitude change needed - create simple level branch
+            branch = Branch(
+                start_point=start_point,
+                end_point=end_point,
+                target_altitude=current_altitude,
+                distance_nm=distance_nm,
+                action="LEVEL",
+                altitude_change_ft=0
+            )
+            branch._start_altitude_ft = current_altitude * FEET_PER_METER
+            branch.end_of_action_point = None
+            return [branch]
+        
+        change_action = "DESCENT" if final_altitude_diff_ft < 0 else "CLIMB"
+        
+        # Calculate distance needed for final descent/climb
+        distance_needed_nm = self._altitude_change_distance_nm(final_altitude_diff_ft)
+        
+        if distance_needed_nm >= distance_nm:
+            # Not enough distance - descend/climb from start of segment
+            branch = Branch(
+                start_point=start_point,
+                end_point=end_point,
+                target_altitude=arrival_altitude,
+                distance_nm=distance_nm,
+                action=change_action,
+                altitude_change_ft=final_altitude_diff_ft
+            )
+            branch._start_altitude_ft = current_altitude * FEET_PER_METER
+            branch.is_unreachable = True
+            branch.unreachable_reason = f"Need {distance_needed_nm:.1f} NM but only {distance_nm:.1f} NM available"
+            return [branch]
+        
+        # Split final branch into level + descent segments
+        level_distance_nm = distance_nm - distance_needed_nm
+        descent_start_fraction = level_distance_nm / distance_nm
+        descent_start_lon, descent_start_lat = self.interpolate_point(start_point, end_point, descent_start_fraction)
+        
+        # Create level segment (waypoint to descent start)
+        level_branch = Branch(
+            start_point=start_point,
+            end_point=KMLPoint(DESCENT_START_NAME, descent_start_lon, descent_start_lat, current_altitude),
+            target_altitude=current_altitude,  # Maintain current altitude
+            distance_nm=level_distance_nm,
+            action="LEVEL",
+            altitude_change_ft=0
+        )
+        level_branch._start_altitude_ft = current_altitude * FEET_PER_METER
+        
+        # Create descent segment (descent start to destination)
+        descent_branch = Branch(
+            start_point=KMLPoint(DESCENT_START_NAME, descent_start_lon, descent_start_lat, current_altitude),
+            end_point=end_point,
+            target_altitude=arrival_altitude,  # Arrival altitude
+            distance_nm=distance_needed_nm,
+            action=change_action,
+            altitude_change_ft=final_altitude_diff_ft
+        )
+        descent_branch._start_altitude_ft = current_altitude * FEET_PER_METER
+        # Descent point at the start of the final descent, at the starting altitude (not midway)
+        descent_branch.end_of_action_point = (descent_start_lon, descent_start_lat, current_altitude)
+        
+        return [level_branch, descent_branch]
+    
+    def print_branch_analysis_table(self, branches: List[Branch]):
+        """Print a table showing branch analysis and actions"""
+        # Build the whole table first and write it in one call
+        lines = [
+            f"\n{'='*80}",
+            "BRANCH ANALYSIS TABLE",
+            f"{'='*80}",
+            f"{'Branch':<20} {'Distance':<10} {'Action':<50}",
+            "-" * 80,
+        ]
+        lines.extend(f"{f'Branch {i}':<20} {f'{branch.distance_nm:.1f} NM':<10} {branch}"
+                     for i, branch in enumerate(branches, 1))
+        
+        unreachable_count = sum(1 for branch in branches if branch.is_unreachable)
+        lines.append("-" * 80)
+        lines.append(f"Total branches: {len(branches)}")
         if unreachable_count > 0:
-            print(f"WARNING: {unreachable_count} branches have UNREACHABLE altitude targets!")
-            print("   Consider adjusting climb/descent rates or reviewing the flight profile.")
-        print(f"{'='*80}")
+            lines.append(f"WARNING: {unreachable_count} branches have UNREACHABLE altitude targets!")
+            lines.append("   Consider adjusting climb/descent rates or reviewing the flight profile.")
+        lines.append(f"{'='*80}")
+        
+        print("\n".join(lines))
     
     def generate_corrected_kml_points(self, points: List[KMLPoint], branches: List[Branch], ground_elevations: Dict[str, float]) -> List[Tuple[str, float, float, float]]:
         """
@@ -571,53 +615,50 @@ class KMLProfileCorrector:
             return [(p.name, p.longitude, p.latitude, p.altitude) for p in points]
         
         # Set corrected altitudes for departure and arrival points
-        departure_elevation = ground_elevations.get(points[0].name, UnitConverter.feet_to_meters(500))
-        departure_altitude = departure_elevation + UnitConverter.feet_to_meters(1000)
+        departure_elevation = ground_elevations.get(points[0].name, DEFAULT_FIELD_ELEVATION_M)
+        departure_altitude = departure_elevation + FIELD_ALTITUDE_OFFSET_M
         
-        arrival_elevation = ground_elevations.get(points[-1].name, UnitConverter.feet_to_meters(500))
-        arrival_altitude = arrival_elevation + UnitConverter.feet_to_meters(1000)
+        arrival_elevation = ground_elevations.get(points[-1].name, DEFAULT_FIELD_ELEVATION_M)
+        arrival_altitude = arrival_elevation + FIELD_ALTITUDE_OFFSET_M
         
         # Track current altitude as we progress
         current_altitude = departure_altitude
         
         # Process each branch and add corrected points in proper sequence
-        processed_waypoints = set()  # Track which waypoints we've already added
+        last_added_name = None  # Consecutive branches share their waypoint: add it once
         
         for i, branch in enumerate(branches):
             # Add the start point with corrected altitude (only once per waypoint)
-            if branch.start_point.name not in processed_waypoints:
+            if branch.start_point.name != last_added_name:
                 # Skip calculated intermediate points like "Descent_Start"
-                if not branch.start_point.name.startswith(("Descent_Start", "Climb_Start")):
+                if not branch.start_point.name.startswith((DESCENT_START_NAME, "Climb_Start")):
                     if i == 0:  # First point - departure altitude
                         corrected_points.append((branch.start_point.name, branch.start_point.longitude, 
                                                branch.start_point.latitude, departure_altitude))
-                        processed_waypoints.add(branch.start_point.name)
                     else:
                         # Add waypoint at current altitude when we reach it
                         corrected_points.append((branch.start_point.name, branch.start_point.longitude,
                                                branch.start_point.latitude, current_altitude))
-                        processed_waypoints.add(branch.start_point.name)
+                    last_added_name = branch.start_point.name
             
             # Add climb/descent action points if needed
             if branch.end_of_action_point and not branch.is_unreachable:
                 lon, lat, alt = branch.end_of_action_point
-                alt_ft = int(UnitConverter.meters_to_feet(alt))
+                target_alt_ft = int(branch.target_altitude * FEET_PER_METER)
                 
                 if branch.action == "DESCENT":
-                    target_alt_ft = int(UnitConverter.meters_to_feet(branch.target_altitude))
                     # Special naming for different types of descents
-                    if "Descent_Start" in branch.start_point.name:
+                    if DESCENT_START_NAME in branch.start_point.name:
                         # Final descent to destination
-                        dest_name = branch.end_point.name.split()[-1] if " " in branch.end_point.name else branch.end_point.name[:4]
-                        current_alt_ft = int(UnitConverter.meters_to_feet(current_altitude))
+                        dest_name = _last_word(branch.end_point.name) or branch.end_point.name[:4]
+                        current_alt_ft = int(current_altitude * FEET_PER_METER)
                         action_name = f"Descent_{current_alt_ft}_{dest_name}"
                     else:
                         # Descent to waypoint altitude - happens AT the waypoint
-                        waypoint_name = branch.end_point.name.split()[-1] if " " in branch.end_point.name else branch.end_point.name
+                        waypoint_name = _last_word(branch.end_point.name) or branch.end_point.name
                         action_name = f"Descent_{waypoint_name}_{target_alt_ft}"
                     corrected_points.append((action_name, lon, lat, alt))
                 else:  # CLIMB
-                    target_alt_ft = int(UnitConverter.meters_to_feet(branch.target_altitude))
                     action_name = f"Climb_{branch.end_point.name}_{target_alt_ft}"
                     corrected_points.append((action_name, lon, lat, alt))
             
@@ -643,96 +684,98 @@ class KMLProfileCorrector:
             Corrected KML content as string
         """
         # Generate new coordinates string for the navigation line
-        coords_list = []
-        for name, lon, lat, alt in corrected_points:
-            coords_list.append(f"{lon},{lat},{alt}")
-        
-        new_coordinates_string = ",".join(coords_list)
-        
-        # Replace the coordinates in the LineString (navigation path)
-        coord_pattern = r'<coordinates>[^<]*</coordinates>'
-        corrected_content = re.sub(coord_pattern, f'<coordinates>{new_coordinates_string}</coordinates>', 
-                                 original_content, count=1)
+        new_coordinates_string = ",".join([f"{lon},{lat},{alt}" for _, lon, lat, alt in corrected_points])
+        coordinates_element = f'<coordinates>{new_coordinates_string}</coordinates>'
         
         # Find the Points folder and replace its content entirely
-        points_folder_pattern = r'(<Folder>\s*<name>Points</name>.*?)(</Folder>)'
+        points_folder_match = POINTS_FOLDER_RE.search(original_content)
         
-        if re.search(points_folder_pattern, corrected_content, re.DOTALL):
+        if points_folder_match:
             # Create new placemarks in correct flight sequence order
-            new_placemarks = []
-            for i, (name, lon, lat, alt) in enumerate(corrected_points):
-                if name.startswith(("Climb_", "Descent_")):
-                    visibility = "0"  # Hidden by default
-                    description = "Climb point" if name.startswith("Climb_") else "Descent point"
-                    style = "#msn_grn-pushpin" if name.startswith("Climb_") else "#msn_red-pushpin"
-                else:
-                    visibility = "1"  # Visible by default for main waypoints
-                    description = f"Waypoint {i+1}"
-                    style = "#msn_ylw-pushpin"
-                    
-                placemark_xml = f'''        <Placemark>
-            <name>{name}</name>
-            <visibility>{visibility}</visibility>
-            <description>{description}</description>
-            <styleUrl>{style}</styleUrl>
-            <Point>
-                <extrude>1</extrude>
-                <altitudeMode>absolute</altitudeMode>
-                <gx:drawOrder>1</gx:drawOrder>
-                <coordinates>{lon},{lat},{alt},</coordinates>
-            </Point>
-        </Placemark>'''
-                new_placemarks.append(placemark_xml)
+            new_placemarks = "\n".join([
+                self._point_placemark_xml(name, lon, lat, alt, f"Waypoint {i+1}", "        ")
+                for i, (name, lon, lat, alt) in enumerate(corrected_points)
+            ])
             
             # Replace the entire Points folder content
             folder_content = f'''    <Folder>
         <name>Points</name>
-{chr(10).join(new_placemarks)}
+{new_placemarks}
     </Folder>'''
             
-            corrected_content = re.sub(points_folder_pattern, folder_content, corrected_content, flags=re.DOTALL)
+            # Splice the new folder and the navigation line coordinates (first <coordinates>)
+            # into the original text, assembling the document with a single join
+            edits = [(points_folder_match.start(), points_folder_match.end(), folder_content)]
+            coordinates_match = COORDINATES_RE.search(original_content)
+            if coordinates_match and not (points_folder_match.start() <= coordinates_match.start()
+                                          < points_folder_match.end()):
+                edits.append((coordinates_match.start(), coordinates_match.end(), coordinates_element))
+            edits.sort()
+            
+            parts = []
+            position = 0
+            for start, end, text in edits:
+                parts.append(original_content[position:start])
+                parts.append(text)
+                position = end
+            parts.append(original_content[position:])
+            corrected_content = "".join(parts)
         else:
-            # Fallback: update existing placemarks and add new ones
-            # Update individual placemark coordinates for main waypoints
-            for name, lon, lat, alt in corrected_points:
-                if not name.startswith(("Climb_", "Descent_")):  # Only update main waypoints
-                    # Pattern to find and update placemark coordinates
-                    placemark_pattern = rf'(<Placemark>.*?<name>{re.escape(name)}</name>.*?<coordinates>)[^<]*(</coordinates>.*?</Placemark>)'
-                    replacement = rf'\g<1>{lon},{lat},{alt},\g<2>'
-                    corrected_content = re.sub(placemark_pattern, replacement, corrected_content, flags=re.DOTALL)
+            # Replace the coordinates in the LineString (navigation path); callable replacements
+            # are inserted verbatim, without parsing the generated text as a template
+            corrected_content = COORDINATES_RE.sub(lambda _: coordinates_element, original_content, count=1)
             
-            # Add new placemarks for climb/descent end points
+            # Fallback: update existing placemarks and add new ones
+            # Split the corrected points in one pass: main waypoints update existing placemarks,
+            # climb/descent end points get new placemarks
+            waypoint_coords = {}
             new_placemarks = []
             for name, lon, lat, alt in corrected_points:
-                if name.startswith(("Climb_", "Descent_")):
-                    visibility = "0"  # Hidden by default
-                    description = "Climb point" if name.startswith("Climb_") else "Descent point"
-                    style = "#msn_grn-pushpin" if name.startswith("Climb_") else "#msn_red-pushpin"
-                    
-                    placemark_xml = f'''    <Placemark>
-        <name>{name}</name>
-        <visibility>{visibility}</visibility>
-        <description>{description}</description>
-        <styleUrl>{style}</styleUrl>
-        <Point>
-            <extrude>1</extrude>
-            <altitudeMode>absolute</altitudeMode>
-            <gx:drawOrder>1</gx:drawOrder>
-            <coordinates>{lon},{lat},{alt},</coordinates>
-        </Point>
-    </Placemark>'''
-                    new_placemarks.append(placemark_xml)
+                if _synthetic_point_kind(name) is None:
+                    waypoint_coords[name] = (lon, lat, alt)
+                else:
+                    new_placemarks.append(self._point_placemark_xml(name, lon, lat, alt, None, "    "))
+            
+            # Update individual placemark coordinates for main waypoints, in a single pass over the placemarks
+            def update_placemark(match):
+                placemark = match.group(0)
+                name_match = NAME_RE.search(placemark)
+                if name_match is None or name_match.group(1) not in waypoint_coords:
+                    return placemark
+                lon, lat, alt = waypoint_coords[name_match.group(1)]
+                coords_match = COORDINATES_RE.search(placemark, name_match.end())
+                if coords_match is None:
+                    return placemark
+                return f"{placemark[:coords_match.start()]}<coordinates>{lon},{lat},{alt},</coordinates>{placemark[coords_match.end():]}"
+            
+            corrected_content = PLACEMARK_RE.sub(update_placemark, corrected_content)
             
             # Insert new placemarks before the closing Document tag
             if new_placemarks:
                 placemarks_text = "\n".join(new_placemarks)
-                document_end_pattern = r'(</Document>)'
-                corrected_content = re.sub(document_end_pattern, placemarks_text + r'\n\g<1>', corrected_content)
+                corrected_content = DOCUMENT_END_RE.sub(lambda match: f"{placemarks_text}\n{match.group(1)}",
+                                                        corrected_content)
         
         return corrected_content
     
-    def correct_kml_file(self, input_file: str, output_file: str):
-        """Main function to correct a KML file with the profile correction algorithm"""
+    def _point_placemark_xml(self, name: str, lon: float, lat: float, alt: float,
+                             waypoint_description: Optional[str], indent: str) -> str:
+        """Point placemark for a corrected profile point (climb/descent points are hidden by default)"""
+        point_kind = _synthetic_point_kind(name)
+        if point_kind is not None:
+            visibility, description, style = point_kind
+        else:
+            visibility, description, style = "1", waypoint_description, "#msn_ylw-pushpin"
+        
+        head, before_description, before_coordinates, tail = _point_placemark_parts(indent, visibility, style)
+        return f"{head}{name}{before_description}{description}{before_coordinates}{lon},{lat},{alt},{tail}"
+    
+    def correct_kml_file(self, input_file: str, output_file: str, verbose: bool = True):
+        """Main function to correct a KML file with the profile correction algorithm
+        
+        Args:
+            verbose: List every extracted and corrected point (summary lines are always printed)
+        """
         print(f"Processing KML file: {input_file}")
         print(f"Using climb rate: {self.climb_rate_fpm} ft/min")
         print(f"Using descent rate: {self.descent_rate_fpm} ft/min")
@@ -740,9 +783,10 @@ class KMLProfileCorrector:
         
         # Parse KML
         points, original_content = self.parse_kml(input_file)
-        print(f"\nExtracted {len(points)} points from KML:")
-        for point in points:
-            print(f"  {point}")
+        print(f"\nExtracted {len(points)} points from KML" + (":" if verbose else ""))
+        if verbose:
+            for point in points:
+                print(f"  {point}")
         
         # Get ground elevations
         print("\nRetrieving ground elevations...")
@@ -762,25 +806,30 @@ class KMLProfileCorrector:
         print("\nGenerating corrected profile points...")
         corrected_points = self.generate_corrected_kml_points(points, branches, ground_elevations)
         
-        print(f"Generated {len(corrected_points)} corrected points:")
-        for name, lon, lat, alt in corrected_points:
-            print(f"  {name}: {UnitConverter.format_altitude(alt)}")
+        print(f"Generated {len(corrected_points)} corrected points" + (":" if verbose else ""))
+        if verbose:
+            for name, lon, lat, alt in corrected_points:
+                print(f"  {name}: {UnitConverter.format_altitude(alt)}")
         
         # Generate corrected KML content
         print(f"\nGenerating corrected KML file...")
         corrected_content = self.generate_corrected_kml(original_content, corrected_points)
         
-        # Ensure output directory exists
-        import os
+        # Ensure output directory exists (single makedirs call, no separate existence check)
         output_dir = os.path.dirname(output_file)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-            print(f"Created directory: {output_dir}")
+        if output_dir:
+            try:
+                os.makedirs(output_dir)
+                print(f"Created directory: {output_dir}")
+            except FileExistsError:
+                pass
         
-        # Save corrected KML file
+        # Save corrected KML file, encoding it slice by slice so that no full-size
+        # bytes copy of the document is held next to the string
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(corrected_content)
+            with open(output_file, 'wb') as f:
+                for offset in range(0, len(corrected_content), WRITE_CHUNK_SIZE):
+                    f.write(corrected_content[offset:offset + WRITE_CHUNK_SIZE].encode('utf-8'))
             print(f"SUCCESS: Corrected KML file saved: {output_file}")
             print(f"   Use kml_profile_viewer.py to visualize the corrected profile.")
         except Exception as e:
@@ -794,36 +843,52 @@ class KMLProfileCorrector:
         # Return success
         return True
     
+    @classmethod
+    def correct_many(cls, kml_files: List[str], max_workers: Optional[int] = None,
+                     **kwargs) -> List[Tuple[List[Branch], List[Tuple[str, float, float, float]]]]:
+        """Analyze several KML files in parallel worker processes
+        
+        Files are parsed and the elevations of all their airfields fetched in one batched
+        call here, so the workers only run the CPU-bound branch analysis.
+        
+        Args:
+            kml_files: KML files to process
+            max_workers: Number of worker processes (defaults to the CPU count)
+            **kwargs: Corrector settings (climb_rate_fpm, descent_rate_fpm, ...)
+            
+        Returns:
+            (branches, corrected_points) for each file, in input order
+        """
+        corrector = cls(**kwargs)
+        parsed_points = [corrector.parse_kml(kml_file)[0] for kml_file in kml_files]
+        endpoints = [(points[0], points[-1]) if len(points) >= 2 else () for points in parsed_points]
+        
+        # One batched request for the departure and destination airfields of every file
+        corrector.elevation_api.prefetch_elevations([
+            (point.latitude, point.longitude) for airfields in endpoints for point in airfields
+        ])
+        
+        # Names such as Point_0 repeat across files: each file gets its own lookup,
+        # resolved by coordinates from the cache filled above
+        ground_elevations = [
+            corrector.elevation_api.get_elevation_for_airports(
+                {point.name: (point.latitude, point.longitude) for point in airfields}, corrector.api_key
+            ) if airfields else {}
+            for airfields in endpoints
+        ]
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_run_one, repeat(cls), parsed_points, ground_elevations, repeat(kwargs)))
+    
     def generate_airspace_kml(self, input_file: str, output_file: str):
         """Generate airspace KML file in the same directory as the corrected profile"""
         try:
-            import sys
-            import os
-            
-            # Add the parent directory to the path to import airspace checker modules
-            parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            airchk_dir = os.path.join(parent_dir, 'navpro')  # Module folder still named navpro
-            
-            # Add both the parent directory and module directory to path
-            sys.path.insert(0, parent_dir)
-            sys.path.insert(0, airchk_dir)
-            
-            # Try different import paths for the flight analyzer and KML service
             try:
-                from core.flight_analyzer import FlightProfileAnalyzer
-                from visualization.kml_generator import KMLVolumeService
-                from core.spatial_query import KMLFlightPathParser
-                db_path = os.path.join(parent_dir, 'data', 'airspaces.db')
-            except ImportError as e1:
-                try:
-                    from navpro.core.flight_analyzer import FlightProfileAnalyzer
-                    from navpro.visualization.kml_generator import KMLVolumeService
-                    from navpro.core.spatial_query import KMLFlightPathParser
-                    db_path = os.path.join(parent_dir, 'data', 'airspaces.db')
-                except ImportError as e2:
-                    print(f"WARNING: Could not import required modules: {e1}, {e2}")
-                    print("   The corrected profile KML was still saved successfully.")
-                    return
+                FlightProfileAnalyzer, KMLVolumeService, KMLFlightPathParser, db_path = _airspace_modules()
+            except ImportError as e:
+                print(f"WARNING: Could not import required modules: {e}")
+                print("   The corrected profile KML was still saved successfully.")
+                return
             
             print(f"\nGenerating airspace KML...")
             
@@ -838,8 +903,15 @@ class KMLProfileCorrector:
                                           corridor_height_ft=500, 
                                           corridor_width_nm=5.0)
             
-            # Get airspace crossings from the corrected KML file
-            crossings = analyzer.get_chronological_crossings(output_file, sample_distance_km=5.0)
+            # Read the corrected KML once: it feeds both the crossing analysis and the flight path
+            with open(output_file, 'r', encoding='utf-8') as f:
+                output_content = f.read()
+            flight_coordinates = KMLFlightPathParser.parse_kml_coordinates_content(output_content)
+            if not flight_coordinates:
+                raise ValueError(f"Failed to parse coordinates from {output_file}")
+            
+            # Get airspace crossings from the corrected flight path
+            crossings = analyzer.get_chronological_crossings_from_coordinates(flight_coordinates, sample_distance_km=5.0)
             
             if not crossings:
                 print(f"WARNING: No airspace crossings found in the corrected flight profile")
@@ -857,25 +929,19 @@ class KMLProfileCorrector:
             base_name = os.path.splitext(os.path.basename(output_file))[0]
             airspace_kml_file = os.path.join(output_dir, f"{base_name}_airspaces.kml")
             
-            # Initialize KML service for generation
-            kml_service = KMLVolumeService(db_path)
-            
-            # Parse flight coordinates and waypoint names from the corrected KML
-            flight_coordinates = KMLFlightPathParser.parse_kml_coordinates(output_file)
-            flight_waypoints = KMLFlightPathParser.parse_kml_waypoints_with_names(output_file)
+            # Waypoint names from the corrected KML content read above
+            flight_waypoints = KMLFlightPathParser.parse_kml_waypoints_with_names_content(output_content)
             
-            # Generate organized KML with flight path and airspaces
+            # Generate organized KML with flight path and airspaces, written to the KML file
             flight_name = os.path.splitext(os.path.basename(output_file))[0]
-            kml_content = kml_service.generate_multiple_airspaces_kml(
-                unique_ids, 
-                flight_name=flight_name,
-                flight_coordinates=flight_coordinates,
-                flight_waypoints=flight_waypoints
-            )
-            
-            # Write KML file
-            with open(airspace_kml_file, 'w', encoding='utf-8') as f:
-                f.write(kml_content)
+            with KMLVolumeService(db_path) as kml_service:
+                kml_service.save_multiple_airspaces_kml(
+                    unique_ids, 
+                    airspace_kml_file,
+                    flight_name=flight_name,
+                    flight_coordinates=flight_coordinates,
+                    flight_waypoints=flight_waypoints
+                )
             
             print(f"SUCCESS: Airspace KML file saved: {airspace_kml_file}")
             print(f"   Load both KML files in Google Earth to see the complete flight analysis.")
@@ -888,10 +954,51 @@ class KMLProfileCorrector:
             print("   The corrected profile KML was still saved successfully.")
 
 
+@lru_cache(maxsize=None)
+def _airspace_modules():
+    """Airspace analysis classes and database path, imported once per process
+    
+    Returns:
+        (FlightProfileAnalyzer, KMLVolumeService, KMLFlightPathParser, db_path)
+        
+    Raises:
+        ImportError: If the airspace checker modules cannot be imported (not cached, retried on next call)
+    """
+    # Add the parent directory to the path to import airspace checker modules
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    airchk_dir = os.path.join(parent_dir, 'navpro')  # Module folder still named navpro
+    
+    # Add both the parent directory and module directory to path
+    sys.path.insert(0, parent_dir)
+    sys.path.insert(0, airchk_dir)
+    
+    # Try different import paths for the flight analyzer and KML service
+    try:
+        from core.flight_analyzer import FlightProfileAnalyzer
+        from visualization.kml_generator import KMLVolumeService
+        from core.spatial_query import KMLFlightPathParser
+    except ImportError as e1:
+        try:
+            from navpro.core.flight_analyzer import FlightProfileAnalyzer
+            from navpro.visualization.kml_generator import KMLVolumeService
+            from navpro.core.spatial_query import KMLFlightPathParser
+        except ImportError as e2:
+            raise ImportError(f"{e1}, {e2}") from e2
+    
+    return FlightProfileAnalyzer, KMLVolumeService, KMLFlightPathParser, os.path.join(parent_dir, 'data', 'airspaces.db')
+
+
+def _run_one(corrector_cls, points: List[KMLPoint], ground_elevations: Dict[str, float],
+             corrector_kwargs: dict) -> Tuple[List[Branch], List[Tuple[str, float, float, float]]]:
+    """Worker for KMLProfileCorrector.correct_many: branch analysis of one parsed file"""
+    corrector = corrector_cls(**corrector_kwargs)
+    branches = corrector.analyze_branches(points, ground_elevations)
+    return branches, corrector.generate_corrected_kml_points(points, branches, ground_elevations)
+
+
 def main():
     """Main function for testing the KML profile corrector"""
     import argparse
-    import os
     
     parser = argparse.ArgumentParser(description='KML profile corrector - works on any KML file')
     parser.add_argument('input_file', help='Input KML file')
@@ -900,6 +1007,9 @@ def main():
     parser.add_argument('--descent-rate', type=float, default=500, help='Descent rate in ft/min (default: 500)')
     parser.add_argument('--ground-speed', type=float, default=100, help='Ground speed in knots (default: 100)')
     parser.add_argument('--api-key', help='API key for elevation services (optional)')
+    parser.add_argument('--no-elevation-cache', action='store_true',
+                        help=f'Do not read or write the airport elevation disk cache ({ELEVATION_CACHE_PATH})')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Do not list every extracted and corrected point')
     
     args = parser.parse_args()
     
@@ -913,10 +1023,11 @@ def main():
         climb_rate_fpm=args.climb_rate,
         descent_rate_fpm=args.descent_rate,
         ground_speed_kts=args.ground_speed,
-        api_key=args.api_key
+        api_key=args.api_key,
+        elevation_cache_path=None if args.no_elevation_cache else ELEVATION_CACHE_PATH
     )
     
-    corrector.correct_kml_file(args.input_file, args.output)
+    corrector.correct_kml_file(args.input_file, args.output, verbose=not args.quiet)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ Shows original profile with branch analysis overlay
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
-import math
 from typing import List, Tuple, Optional, Dict
 import argparse
 import os
@@ -88,18 +87,7 @@ class KMLProfileViewer:
     
     def calculate_distance_nm(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate great circle distance between two points in nautical miles"""
-        lat1, lon1 = math.radians(lat1), math.radians(lon1)
-        lat2, lon2 = math.radians(lat2), math.radians(lon2)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        R_km = 6371.0
-        distance_km = R_km * c
-        return UnitConverter.km_to_nautical_miles(distance_km)
+        return UnitConverter.haversine_nm(lat1, lon1, lat2, lon2)
     
     def visualize_profile(self, kml_file: str, output_file: str = None, title: str = None):
         """
@@ -116,13 +104,10 @@ class KMLProfileViewer:
             return
         
         # Calculate cumulative distances
-        cumulative_distances = [0.0]
-        for i in range(1, len(points)):
-            prev_point = points[i-1]
-            curr_point = points[i]
-            dist = self.calculate_distance_nm(prev_point.latitude, prev_point.longitude, 
-                                            curr_point.latitude, curr_point.longitude)
-            cumulative_distances.append(cumulative_distances[-1] + dist)
+        # Display only: the equirectangular approximation is enough at VFR leg lengths
+        leg_distances = UnitConverter.equirectangular_distances_nm(
+            [p.latitude for p in points], [p.longitude for p in points])
+        cumulative_distances = [0.0] + np.cumsum(leg_distances).tolist()
         
         # Convert altitudes to feet 
         altitudes_ft = [UnitConverter.meters_to_feet(p.altitude) for p in points]